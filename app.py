@@ -1,13 +1,16 @@
 import os
-import mimetypes
-from flask import Flask, send_from_directory
+from flask import Flask, request, abort, jsonify
+from asset_store import open_store, CHUNK_SIZE, plan_response
+from scores import ScoreBoard, clean_submission
 
 app = Flask(__name__, static_folder='build/web')
 
-mimetypes.add_type('application/wasm', '.wasm')
-mimetypes.add_type('application/octet-stream', '.so')
-mimetypes.add_type('application/octet-stream', '.apk')
-mimetypes.add_type('text/javascript', '.js')
+# The build never changes while the container runs, so it is indexed once.
+# WEB_ROOT may point at the pygbag web.zip instead of the extracted folder.
+assets = open_store(os.environ.get('WEB_ROOT', app.static_folder))
+
+# Submissions are buffered and written to SQLite in batches by a background thread
+scoreboard = ScoreBoard(os.environ.get('SCORES_DB', os.path.join(app.root_path, 'scores.sqlite3')))
 
 @app.after_request
 def add_header(response):
@@ -16,13 +19,48 @@ def add_header(response):
     response.headers['Cross-Origin-Embedder-Policy'] = 'credentialless'
     return response
 
+def send_asset(path):
+    """Answers from the in-memory index (see asset_store.plan_response)."""
+    plan = plan_response(assets, path, request.headers.get)
+    if plan.status == 404:
+        abort(404)
+    if plan.status not in (200, 206):
+        return app.response_class(status=plan.status, headers=plan.headers)
+
+    asset = plan.asset
+    file_wrapper = request.environ.get('wsgi.file_wrapper')
+    if asset.mapped and asset.filename and plan.whole and file_wrapper is not None:
+        # Big whole-file responses go out via the server's sendfile
+        body = file_wrapper(open(asset.filename, 'rb'), CHUNK_SIZE)
+    else:
+        body = asset.chunks(plan.start, plan.stop)
+    return app.response_class(body, status=plan.status, headers=plan.headers, direct_passthrough=True)
+
+@app.route('/api/scores', methods=['POST'])
+def submit_score():
+    try:
+        row = clean_submission(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    if not scoreboard.submit(row):
+        return jsonify(error='score buffer full, try again later'), 503, {'Retry-After': '5'}
+    return jsonify(queued=True), 202
+
+@app.route('/api/scores', methods=['GET'])
+def top_scores():
+    limit = max(1, min(request.args.get('limit', 10, type=int), scoreboard.top_size))
+    response = jsonify(scores=scoreboard.top(limit))
+    # The list only changes when a batch is flushed
+    response.headers['Cache-Control'] = 'public, max-age=5'
+    return response
+
 @app.route('/')
 def index():
-    return send_from_directory(app.static_folder, 'index.html')
+    return send_asset('index.html')
 
 @app.route('/<path:path>')
 def serve_static(path):
-    return send_from_directory(app.static_folder, path)
+    return send_asset(path)
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
@@ -0,0 +1,142 @@
+"""Async entry point for the game host: the same routes and headers as app.py.
+
+A plain ASGI app with no framework, for many concurrent slow downloads on
+one instance:
+
+    uvicorn asgi:app --host 0.0.0.0 --port $PORT
+
+Bodies go out in STREAM_CHUNK pieces and each send() is awaited, so the
+server's flow control (not our memory) absorbs slow clients.
+"""
+import os
+import json
+from urllib.parse import parse_qs
+from asset_store import open_store, plan_response
+from scores import ScoreBoard, clean_submission
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WEB_ROOT = os.path.join(HERE, 'build', 'web')
+STREAM_CHUNK = 64 * 1024
+MAX_SCORE_BODY = 4096  # A submission is a few dozen bytes of JSON
+
+# Same values as add_header in app.py
+CROSS_ORIGIN_HEADERS = [
+    (b'cross-origin-opener-policy', b'same-origin'),
+    (b'cross-origin-embedder-policy', b'credentialless'),
+]
+
+assets = open_store(os.environ.get('WEB_ROOT', WEB_ROOT))
+
+# Same database file as app.py, so either entry point serves the same leaderboard
+scoreboard = ScoreBoard(os.environ.get('SCORES_DB', os.path.join(HERE, 'scores.sqlite3')))
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            scoreboard.close()  # Writes out whatever is still buffered
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def send_simple(send, status, text, headers=()):
+    body = text.encode()
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'text/plain; charset=utf-8'),
+                            (b'content-length', str(len(body)).encode()),
+                            *headers, *CROSS_ORIGIN_HEADERS]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, status, payload, headers=()):
+    body = json.dumps(payload).encode()
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json'),
+                            (b'content-length', str(len(body)).encode()),
+                            *headers, *CROSS_ORIGIN_HEADERS]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def read_body(receive, limit):
+    """The request body, or None if the client went away or sent more than limit bytes."""
+    body = b''
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body += message.get('body', b'')
+        if len(body) > limit:
+            return None
+        if not message.get('more_body'):
+            return body
+
+
+async def scores(scope, receive, send):
+    """/api/scores, as in app.py: POST buffers a run, GET lists the top scores."""
+    if scope['method'] == 'POST':
+        body = await read_body(receive, MAX_SCORE_BODY)
+        if body is None:
+            await send_json(send, 413, {'error': 'request body too large'})
+            return
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None  # Like get_json(silent=True) in app.py
+        try:
+            row = clean_submission(data)
+        except ValueError as e:
+            await send_json(send, 400, {'error': str(e)})
+            return
+        if not scoreboard.submit(row):
+            await send_json(send, 503, {'error': 'score buffer full, try again later'}, [(b'retry-after', b'5')])
+            return
+        await send_json(send, 202, {'queued': True})
+        return
+
+    query = parse_qs(scope['query_string'].decode('latin-1'))
+    try:
+        limit = int(query.get('limit', ['10'])[0])
+    except ValueError:
+        limit = 10
+    limit = max(1, min(limit, scoreboard.top_size))
+    # The list only changes when a batch is flushed
+    await send_json(send, 200, {'scores': scoreboard.top(limit)}, [(b'cache-control', b'public, max-age=5')])
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+    if scope['path'] == '/api/scores':
+        if scope['method'] not in ('GET', 'HEAD', 'POST'):
+            await send_simple(send, 405, 'Method Not Allowed', [(b'allow', b'GET, HEAD, POST')])
+            return
+        await scores(scope, receive, send)
+        return
+    if scope['method'] not in ('GET', 'HEAD'):
+        await send_simple(send, 405, 'Method Not Allowed', [(b'allow', b'GET, HEAD')])
+        return
+
+    path = scope['path'].lstrip('/') or 'index.html'
+    request_headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+    plan = plan_response(assets, path, lambda name: request_headers.get(name.lower()))
+    if plan.status == 404:
+        await send_simple(send, 404, 'Not Found')
+        return
+
+    headers = [(name.lower().encode(), value.encode('latin-1')) for name, value in plan.headers.items()]
+    if plan.status == 416:
+        # A 304 must not claim a length; its headers describe the cached body
+        headers.append((b'content-length', b'0'))
+    await send({'type': 'http.response.start', 'status': plan.status, 'headers': headers + CROSS_ORIGIN_HEADERS})
+    if scope['method'] == 'HEAD' or plan.status not in (200, 206):
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+    for chunk in plan.asset.chunks(plan.start, plan.stop, STREAM_CHUNK):
+        await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
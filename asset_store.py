@@ -0,0 +1,297 @@
+"""Immutable in-memory index of the web build (a directory or web.zip), loaded once at startup.
+
+Every asset's bytes (or an mmap, for big files), length, strong ETag, MIME
+type, cache policy and precompressed variants are worked out up front, so a
+request is a dict lookup plus header formatting; no per-request open/stat.
+"""
+import os
+import re
+import time
+import mmap
+import zlib
+import struct
+import hashlib
+import zipfile
+import mimetypes
+from email.utils import formatdate
+from werkzeug.http import parse_accept_header, parse_range_header, parse_if_range_header
+from werkzeug.sansio.http import is_resource_modified
+from werkzeug.utils import get_content_type
+
+mimetypes.add_type('application/wasm', '.wasm')
+mimetypes.add_type('application/octet-stream', '.so')
+mimetypes.add_type('application/octet-stream', '.apk')
+mimetypes.add_type('text/javascript', '.js')
+
+# Precompressed variants written by compress_assets.py, best first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+# Content-hashed names (e.g. web-cache/38e02d12...ed.png) never change in place
+HASHED_NAME = re.compile(r'(^|[/.-])[0-9a-f]{16,}\.[^/]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+MMAP_THRESHOLD = 8 * 1024 * 1024  # Bigger files are mapped instead of read into the heap
+CHUNK_SIZE = 256 * 1024
+
+
+class Asset:
+    """One representation of a file: its body, length and validators."""
+
+    __slots__ = ('path', 'filename', 'data', 'length', 'etag', 'mtime', 'last_modified',
+                 'content_type', 'encoding', 'cache_control', 'variants')
+
+    def __init__(self, path, filename, data, mtime, mimetype, encoding=None, etag=None, length=None):
+        self.path = path
+        self.filename = filename  # Whole file on disk, for sendfile; None for archive members
+        self.data = data          # bytes, an mmap for big files, or a memoryview into a mapped archive
+        self.length = len(data) if length is None else length
+        self.etag = etag or hashlib.blake2b(data, digest_size=12).hexdigest()
+        self.mtime = int(mtime)
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+        self.content_type = get_content_type(mimetype, 'utf-8')  # Adds the charset to text types
+        self.encoding = encoding
+        self.cache_control = IMMUTABLE if HASHED_NAME.search(path) else REVALIDATE
+        self.variants = {}        # Encoding -> Asset
+
+    @property
+    def mapped(self):
+        return not isinstance(self.data, bytes)
+
+    def negotiate(self, accept_encodings):
+        """The smallest variant the client accepts (self if none)."""
+        for name, _ in ENCODINGS:
+            # Indexing gives the quality: 0 when absent or refused with q=0, wildcards included
+            if name in self.variants and accept_encodings[name] > 0:
+                return self.variants[name]
+        return self
+
+    def chunks(self, start=0, stop=None, size=None):
+        """Body bytes in [start, stop), in pieces of at most size bytes.
+
+        Without a size, an in-memory body goes out as one piece (the whole
+        body without a copy); mapped bodies always go in CHUNK_SIZE pieces.
+        """
+        stop = self.length if stop is None else stop
+        if size is None and not self.mapped:
+            yield self.data if (start, stop) == (0, self.length) else self.data[start:stop]
+            return
+        size = size or CHUNK_SIZE
+        for offset in range(start, stop, size):
+            yield bytes(self.data[offset:min(offset + size, stop)])
+
+
+class InflatedMember(Asset):
+    """The identity body of a deflated archive member, inflated on first use.
+
+    Most clients take the gzip variant, so the inflated copy is only made
+    (and then kept) once some client refuses gzip.
+    """
+
+    __slots__ = ('store', 'info')
+
+    def __init__(self, store, info, mtime, mimetype, etag):
+        super().__init__(info.filename, None, None, mtime, mimetype, etag=etag, length=info.file_size)
+        self.store = store
+        self.info = info
+
+    @property
+    def mapped(self):
+        return False
+
+    def chunks(self, start=0, stop=None, size=None):
+        if self.data is None:
+            # Racing threads may both inflate; either result is the same bytes
+            self.data = self.store.inflate(self.info)
+        return super().chunks(start, stop, size)
+
+
+def load_file(filename):
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        if size >= MMAP_THRESHOLD:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return f.read()
+
+
+class AssetStore:
+    """Maps URL paths ('index.html', 'web-cache/x.png') to Assets under root."""
+
+    def __init__(self, root):
+        self.root = root
+        self.assets = {}
+        self.bytes = 0
+        for folder, _, files in os.walk(root):
+            names = set(files)
+            for name in files:
+                # A .gz/.br is a variant only if its original sits next to it; otherwise it is served as is
+                if any(name.endswith(suffix) and name[:-len(suffix)] in names for _, suffix in ENCODINGS):
+                    continue
+                filename = os.path.join(folder, name)
+                path = os.path.relpath(filename, root).replace(os.sep, '/')
+                self.assets[path] = self._load(path, filename)
+
+    def _load(self, path, filename):
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        mtime = os.path.getmtime(filename)
+        asset = Asset(path, filename, load_file(filename), mtime, mimetype)
+        self.bytes += asset.length
+        for encoding, suffix in ENCODINGS:
+            variant_file = filename + suffix
+            # A variant older than its original is stale; leave it out
+            if os.path.isfile(variant_file) and os.path.getmtime(variant_file) >= mtime:
+                variant = Asset(path, variant_file, load_file(variant_file), mtime, mimetype, encoding)
+                asset.variants[encoding] = variant
+                self.bytes += variant.length
+        return asset
+
+    def get(self, path):
+        return self.assets.get(path)
+
+    def __len__(self):
+        return len(self.assets)
+
+
+# gzip member header: magic, deflate, no flags, mtime 0, no extra flags, OS unknown
+GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+
+
+class ZipAssetStore(AssetStore):
+    """Serves the members of a pygbag web.zip straight out of one mmapped archive.
+
+    The central directory is read once. Stored members are views into the
+    map. A deflated member's raw stream, copied once into a heap buffer
+    between a gzip header and the CRC-32 and size the zip already records,
+    is its gzip variant, so nothing is recompressed. Its identity body is
+    only inflated when a client first refuses gzip. .gz/.br members next
+    to a file are used as its variants.
+    """
+
+    def __init__(self, path):
+        self.root = path
+        self.assets = {}
+        self.bytes = 0
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with zipfile.ZipFile(path) as archive:
+            members = {info.filename: info for info in archive.infolist() if not info.is_dir()}
+            for name, info in members.items():
+                if any(name.endswith(suffix) and name[:-len(suffix)] in members for _, suffix in ENCODINGS):
+                    continue
+                self.assets[name] = self._load_member(archive, members, info)
+
+    def _raw(self, info):
+        """A view of the member's bytes as stored in the archive."""
+        name_length, extra_length = struct.unpack_from('<HH', self.map, info.header_offset + 26)
+        start = info.header_offset + 30 + name_length + extra_length
+        return memoryview(self.map)[start:start + info.compress_size]
+
+    def inflate(self, info):
+        """The member's uncompressed bytes, checked against the recorded CRC-32."""
+        data = zlib.decompress(self._raw(info), -zlib.MAX_WBITS)
+        if zlib.crc32(data) != info.CRC:
+            raise zipfile.BadZipFile(f'bad CRC-32 for {info.filename}')
+        return data
+
+    def _load_member(self, archive, members, info):
+        path = info.filename
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        mtime = time.mktime(info.date_time + (0, 0, -1))
+        etag = f'{info.CRC:08x}-{info.file_size:x}'
+        if info.compress_type == zipfile.ZIP_STORED:
+            asset = Asset(path, None, self._raw(info), mtime, mimetype, etag=etag)
+        elif info.compress_type == zipfile.ZIP_DEFLATED:
+            asset = InflatedMember(self, info, mtime, mimetype, etag)
+            trailer = struct.pack('<II', info.CRC, info.file_size & 0xFFFFFFFF)
+            gzipped = GZIP_HEADER + self._raw(info) + trailer
+            asset.variants['gzip'] = Asset(path, None, gzipped, mtime, mimetype, 'gzip', etag=etag + '-gz')
+        else:
+            asset = Asset(path, None, archive.read(info), mtime, mimetype, etag=etag)
+        self.bytes += asset.length + sum(variant.length for variant in asset.variants.values())
+
+        for encoding, suffix in ENCODINGS:
+            variant_info = members.get(path + suffix)
+            if variant_info is None:
+                continue
+            if variant_info.compress_type == zipfile.ZIP_STORED:
+                data = self._raw(variant_info)
+            else:
+                data = archive.read(variant_info)
+            asset.variants[encoding] = Asset(path, None, data, mtime, mimetype, encoding,
+                                             etag=f'{variant_info.CRC:08x}-{variant_info.file_size:x}')
+            self.bytes += len(data)
+        return asset
+
+
+def open_store(path):
+    """AssetStore for a build directory, ZipAssetStore for a .zip bundle."""
+    return ZipAssetStore(path) if path.endswith('.zip') else AssetStore(path)
+
+
+class Plan:
+    """What to send for one GET: status, headers, and the asset bytes [start, stop)."""
+
+    __slots__ = ('status', 'headers', 'asset', 'start', 'stop')
+
+    def __init__(self, status, headers, asset=None, start=0, stop=0):
+        self.status = status
+        self.headers = headers
+        self.asset = asset
+        self.start = start
+        self.stop = stop
+
+    @property
+    def whole(self):
+        return self.status == 200
+
+
+def requested_range(asset, range_header, if_range_header):
+    """(start, stop) for a single satisfiable Range, None for the whole body, or False if unsatisfiable."""
+    rng = parse_range_header(range_header)
+    if rng is None or rng.units != 'bytes' or len(rng.ranges) != 1:
+        return None
+    # If-Range: a stale validator means the client gets the whole, current body
+    if_range = parse_if_range_header(if_range_header)
+    if if_range.etag and if_range.etag != asset.etag:
+        return None
+    if if_range.date and int(if_range.date.timestamp()) != asset.mtime:
+        return None
+    return rng.range_for_length(asset.length) or False
+
+
+def plan_response(store, path, header):
+    """Plans the answer to a GET of path; header(name) returns a request header or None.
+
+    Shared by the WSGI and ASGI servers: picks the variant by
+    Accept-Encoding, answers 304 for a matching validator and 206/416 for
+    a single byte Range.
+    """
+    original = store.get(path)
+    if original is None:
+        return Plan(404, {})
+    asset = original.negotiate(parse_accept_header(header('Accept-Encoding')))
+
+    headers = {
+        'ETag': f'"{asset.etag}"',
+        'Last-Modified': asset.last_modified,
+        'Cache-Control': asset.cache_control,
+        'Accept-Ranges': 'bytes',
+        'Vary': 'Accept-Encoding',
+    }
+    if asset.encoding:
+        headers['Content-Encoding'] = asset.encoding
+    if not is_resource_modified(http_if_modified_since=header('If-Modified-Since'),
+                                http_if_none_match=header('If-None-Match'),
+                                etag=asset.etag, last_modified=asset.last_modified):
+        return Plan(304, headers, asset)
+
+    span = requested_range(asset, header('Range'), header('If-Range'))
+    if span is False:
+        headers['Content-Range'] = f'bytes */{asset.length}'
+        return Plan(416, headers, asset)
+    headers['Content-Type'] = asset.content_type
+    if span:
+        start, stop = span
+        headers['Content-Range'] = f'bytes {start}-{stop - 1}/{asset.length}'
+        headers['Content-Length'] = str(stop - start)
+        return Plan(206, headers, asset, start, stop)
+    headers['Content-Length'] = str(asset.length)
+    return Plan(200, headers, asset, 0, asset.length)
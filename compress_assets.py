@@ -0,0 +1,92 @@
+"""Build step: writes .gz (and .br, if brotli is installed) next to each web asset.
+
+The servers pick a variant by Accept-Encoding, so nothing is compressed per
+request. Variants are only kept when they are meaningfully smaller, and are
+rewritten whenever the original is newer.
+
+Given a .zip bundle instead, compressible members are re-stored deflated
+(level 9) so the server can pass them through as gzip.
+
+    python compress_assets.py build/web
+    python compress_assets.py web_deploy
+    python compress_assets.py game/build/web.zip
+"""
+import os
+import sys
+import gzip
+import zipfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Already-compressed formats gain nothing
+SKIP_SUFFIXES = {".gz", ".br", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ogg", ".mp3", ".zip", ".py", ".pyc"}
+MIN_SIZE = 1024
+MIN_SAVING = 0.9  # Keep a variant only if it is under 90% of the original
+
+
+def compressors():
+    yield ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", lambda data: brotli.compress(data, quality=11)
+
+
+def compress_tree(root):
+    written = 0
+    for folder, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(folder, name)
+            if os.path.splitext(name)[1].lower() in SKIP_SUFFIXES or os.path.getsize(path) < MIN_SIZE:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            for suffix, compress in compressors():
+                target = path + suffix
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    continue
+                packed = compress(data)
+                if len(packed) > len(data) * MIN_SAVING:
+                    if os.path.exists(target):
+                        os.remove(target)
+                    continue
+                with open(target, "wb") as f:
+                    f.write(packed)
+                written += 1
+                print(f"{target}: {len(data)} -> {len(packed)} bytes")
+    return written
+
+
+def compress_zip(path):
+    """Rewrites path with compressible members deflated; returns how many changed."""
+    changed = 0
+    temp = path + ".tmp"
+    with zipfile.ZipFile(path) as source, zipfile.ZipFile(temp, "w") as target:
+        for info in source.infolist():
+            data = source.read(info)
+            method = info.compress_type
+            if method == zipfile.ZIP_STORED and len(data) >= MIN_SIZE \
+                    and os.path.splitext(info.filename)[1].lower() not in SKIP_SUFFIXES:
+                packed = gzip.compress(data, compresslevel=9)
+                if len(packed) <= len(data) * MIN_SAVING:
+                    method = zipfile.ZIP_DEFLATED
+                    changed += 1
+                    print(f"{path}:{info.filename}: {len(data)} -> ~{len(packed)} bytes")
+            member = zipfile.ZipInfo(info.filename, info.date_time)
+            member.external_attr = info.external_attr
+            member.compress_type = method
+            target.writestr(member, data, compresslevel=9 if method == zipfile.ZIP_DEFLATED else None)
+    os.replace(temp, path)
+    return changed
+
+
+if __name__ == "__main__":
+    roots = sys.argv[1:] or ["build/web"]
+    if brotli is None:
+        print("brotli not installed; writing gzip variants only")
+    for root in roots:
+        if root.endswith(".zip"):
+            compress_zip(root)
+        else:
+            compress_tree(root)
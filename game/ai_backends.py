@@ -0,0 +1,218 @@
+import json
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+import constants as C
+
+
+class AIBackend(ABC):
+    """What AIGateway needs from a model provider.
+
+    Both methods block and are called on worker threads. generate() returns
+    the full response text; stream() yields text chunks as they arrive.
+    Errors are raised as-is; quota errors carry code=429 (see is_quota_error).
+
+    A subclass missing either method can't be instantiated. Classes that
+    define both without subclassing still pass isinstance(), which
+    AIGateway checks, so a half-built backend fails when it is handed over
+    rather than on the first call in a worker thread.
+    """
+
+    @abstractmethod
+    def generate(self, model, prompt, config=None):
+        ...
+
+    @abstractmethod
+    def stream(self, model, prompt):
+        ...
+
+    @classmethod
+    def __subclasshook__(cls, other):
+        if cls is AIBackend:
+            return all(callable(getattr(other, name, None)) for name in ("generate", "stream"))
+        return NotImplemented
+
+
+class GenAIBackend(AIBackend):
+    """google.genai Client (client.models.*)."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def generate(self, model, prompt, config=None):
+        kwargs = {"model": model, "contents": prompt}
+        if config is not None:
+            kwargs["config"] = config
+        return self.client.models.generate_content(**kwargs).text
+
+    def stream(self, model, prompt):
+        for chunk in self.client.models.generate_content_stream(model=model, contents=prompt):
+            yield chunk.text
+
+
+class LegacyGenAIBackend(AIBackend):
+    """The older google.generativeai module, as loaded by desktop_imports."""
+
+    def __init__(self, genai):
+        self.genai = genai
+        self.models = {}
+
+    def _model(self, name):
+        if name not in self.models:
+            self.models[name] = self.genai.GenerativeModel(name)
+        return self.models[name]
+
+    def generate(self, model, prompt, config=None):
+        return self._model(model).generate_content(prompt, generation_config=config).text
+
+    def stream(self, model, prompt):
+        for chunk in self._model(model).generate_content(prompt, stream=True):
+            yield chunk.text
+
+
+def wrap_client(client):
+    """The backend for whatever desktop_imports produced, or None."""
+    if client is None:
+        return None
+    if hasattr(client, "models"):
+        return GenAIBackend(client)
+    if hasattr(client, "GenerativeModel"):
+        return LegacyGenAIBackend(client)
+    raise TypeError(f"unsupported AI client: {client!r}")
+
+
+# --- LOCAL STAND-IN ---
+
+class SimulatedAPIError(Exception):
+    """Shaped like google.genai's APIError so the limiter treats it the same."""
+
+    def __init__(self, code, status, message):
+        super().__init__(f"{code} {status}. {message}")
+        self.code = code
+        self.status = status
+
+
+SIM_WORDS = ["packet", "worm", "kernel", "null", "proxy", "cipher", "daemon", "shard", "vector", "ghost"]
+
+# name -> SimulatedBackend keyword arguments
+SIM_PROFILES = {
+    "fast": dict(latency_ms=(40, 0.2), chunk_ms=5),
+    "realistic": dict(latency_ms=(700, 0.5), chunk_ms=60, error_rate=0.02),
+    "slow": dict(latency_ms=(3000, 0.6), chunk_ms=250, error_rate=0.05),
+    "flaky": dict(latency_ms=(900, 0.8), chunk_ms=80, error_rate=0.3, hang_rate=0.05),
+    "quota": dict(latency_ms=(700, 0.5), chunk_ms=60, quota_burst=(20, 10)),
+    "outage": dict(latency_ms=(700, 0.5), error_rate=1.0),
+}
+
+
+class SimulatedBackend(AIBackend):
+    """In-process stand-in for Gemini with injected latency and failures.
+
+    - latency_ms: (median, sigma) of a log-normal time to first byte
+    - chunk_ms: delay between streamed chunks
+    - error_rate: chance a call fails with a 503
+    - hang_rate: chance a call stalls for hang_ms before failing (outlasts the gateway deadline)
+    - quota_burst: (period, duration) in seconds; for the first `duration` seconds
+      of every `period` all calls get a 429 with a retryDelay hint
+
+    Responses are made up locally; JSON calls get data matching their schema.
+    seed makes the sequence of latencies and failures repeatable.
+    """
+
+    def __init__(self, latency_ms=(700, 0.5), chunk_ms=60, error_rate=0.0, hang_rate=0.0, hang_ms=30000,
+                 quota_burst=None, seed=None, clock=time.monotonic, sleep=time.sleep):
+        self.latency_ms = latency_ms
+        self.chunk_ms = chunk_ms
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_ms = hang_ms
+        self.quota_burst = quota_burst
+        self.clock = clock
+        self.sleep = sleep
+        self.started = clock()
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()  # Random isn't shared safely across worker threads
+        self.calls = 0
+        self.failures = 0
+
+    @classmethod
+    def from_profile(cls, name, **overrides):
+        return cls(**{**SIM_PROFILES[name], **overrides})
+
+    def _draw(self):
+        """Picks this call's latency (s) and failure, if any."""
+        with self.lock:
+            self.calls += 1
+            median, sigma = self.latency_ms
+            latency = median * self.random.lognormvariate(0, sigma) / 1000
+            roll = self.random.random()
+        if self.quota_burst:
+            period, duration = self.quota_burst
+            if (self.clock() - self.started) % period < duration:
+                retry = duration - (self.clock() - self.started) % period
+                return latency / 4, SimulatedAPIError(
+                    429, "RESOURCE_EXHAUSTED", f"Quota exceeded. {{'retryDelay': '{retry:.0f}s'}}")
+        if roll < self.hang_rate:
+            return self.hang_ms / 1000, SimulatedAPIError(504, "DEADLINE_EXCEEDED", "Request timed out.")
+        if roll < self.hang_rate + self.error_rate:
+            return latency, SimulatedAPIError(503, "UNAVAILABLE", "The model is overloaded.")
+        return latency, None
+
+    def _fail(self, error):
+        with self.lock:
+            self.failures += 1
+        raise error
+
+    def generate(self, model, prompt, config=None):
+        latency, error = self._draw()
+        self.sleep(latency)
+        if error:
+            self._fail(error)
+        schema = (config or {}).get("response_schema")
+        if schema is not None:
+            return json.dumps(self._fake(schema))
+        return self._sentence()
+
+    def stream(self, model, prompt):
+        latency, error = self._draw()
+        self.sleep(latency)
+        if error:
+            self._fail(error)
+        words = self._sentence().split(" ")
+        for i, word in enumerate(words):
+            if i:
+                self.sleep(self.chunk_ms / 1000)
+            yield word if i == len(words) - 1 else word + " "
+
+    def _sentence(self):
+        with self.lock:
+            words = self.random.sample(SIM_WORDS, 6)
+        return "SIM: " + " ".join(words).capitalize() + "."
+
+    def _fake(self, schema):
+        kind = schema.get("type")
+        if kind == "ARRAY":
+            return [self._fake(schema["items"]) for _ in range(C.LORE_BATCH_SIZE)]
+        if kind == "OBJECT":
+            return {name: self._fake(prop) for name, prop in schema["properties"].items()}
+        if "enum" in schema:
+            with self.lock:
+                return self.random.choice(schema["enum"])
+        return self._sentence()
+
+
+def backend_from_setting(setting, client):
+    """C.AI_BACKEND -> backend: "gemini" wraps the SDK client, "sim:<profile>" the stand-in.
+
+    An unknown profile is reported and leaves the game without AI (None).
+    """
+    if setting.startswith("sim"):
+        _, _, profile = setting.partition(":")
+        profile = profile or "realistic"
+        if profile not in SIM_PROFILES:
+            print(f"Simulated AI Load Failed: unknown profile {profile!r} "
+                  f"(choose from {', '.join(sorted(SIM_PROFILES))})")
+            return None
+        return SimulatedBackend.from_profile(profile)
+    return wrap_client(client)
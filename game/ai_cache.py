@@ -0,0 +1,89 @@
+import random
+import sqlite3
+import time
+import constants as C
+
+
+class ResponseCache:
+    """On-disk cache of Gemini responses keyed by (model, prompt, game-state bucket).
+
+    Up to `variants` different texts are kept per key. Until a key has that
+    many, get() misses so the network fills it; after that a random variant
+    is served, so repeated prompts stay varied without spending quota.
+    Entries expire after `ttl` seconds and the least recently used ones are
+    evicted beyond `max_entries`.
+    """
+
+    def __init__(self, path=C.AI_CACHE_PATH, ttl=C.AI_CACHE_TTL_SECONDS,
+                 max_entries=C.AI_CACHE_MAX_ENTRIES, variants=C.AI_CACHE_VARIANTS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.variants = variants
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")  # Losing the last write on a crash is fine for a cache
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                model TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                text TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                UNIQUE (model, prompt, bucket, text)
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.expire()
+
+    def _variants(self, model, prompt, bucket):
+        return self.db.execute(
+            "SELECT rowid, text FROM responses WHERE model = ? AND prompt = ? AND bucket = ? AND created > ?",
+            (model, prompt, bucket, time.time() - self.ttl)).fetchall()
+
+    def _touch(self, rowid):
+        self.db.execute("UPDATE responses SET last_used = ? WHERE rowid = ?", (time.time(), rowid))
+        self.db.commit()
+
+    def get(self, model, prompt, bucket=""):
+        """A random cached variant once the key is full, otherwise None."""
+        rows = self._variants(model, prompt, bucket)
+        if len(rows) < self.variants:
+            self.misses += 1
+            return None
+        self.hits += 1
+        rowid, text = random.choice(rows)
+        self._touch(rowid)
+        return text
+
+    def get_any(self, model, prompt, bucket=""):
+        """Any unexpired variant, for when the network is down. None if there is none."""
+        rows = self._variants(model, prompt, bucket)
+        if not rows:
+            return None
+        rowid, text = random.choice(rows)
+        self._touch(rowid)
+        return text
+
+    def put(self, model, prompt, bucket, text):
+        now = time.time()
+        self.db.execute(
+            "INSERT OR IGNORE INTO responses (model, prompt, bucket, text, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (model, prompt, bucket, text, now, now))
+        self._evict()
+        self.db.commit()
+
+    def expire(self):
+        self.db.execute("DELETE FROM responses WHERE created <= ?", (time.time() - self.ttl,))
+        self.db.commit()
+
+    def _evict(self):
+        (count,) = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            self.db.execute(
+                "DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,))
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,422 @@
+import asyncio
+import json
+import queue
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+import constants as C
+from ai_limits import TokenBucket, CircuitBreaker, Throttled
+from ai_backends import AIBackend
+
+
+class TextStream:
+    """Chunks of one streamed response, handed from a worker thread to the game loop.
+
+    The worker pushes chunk texts and then marks the stream done; the game
+    reads `done` before drain(), so once it sees done every chunk is in hand.
+    """
+
+    def __init__(self):
+        self.chunks = queue.SimpleQueue()
+        self.parts = []
+        self.started = time.perf_counter()
+        self.first_chunk_at = None
+        self.finished_at = None
+        self.error = None
+        self.done = False
+        self.cancelled = False  # Tells the worker to stop reading
+
+    def push(self, text):
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.perf_counter()
+        self.parts.append(text)
+        self.chunks.put(text)
+
+    def finish(self, error=None):
+        if self.done:
+            return
+        self.error = error
+        self.finished_at = time.perf_counter()
+        self.done = True
+
+    def drain(self):
+        """Every chunk received since the last drain, joined ('' if none)."""
+        texts = []
+        while True:
+            try:
+                texts.append(self.chunks.get_nowait())
+            except queue.Empty:
+                return "".join(texts)
+
+    @property
+    def text(self):
+        return "".join(self.parts)
+
+    @property
+    def ttfc_ms(self):
+        """Time to first chunk, None until one arrives."""
+        if self.first_chunk_at is None:
+            return None
+        return (self.first_chunk_at - self.started) * 1000
+
+    @property
+    def total_ms(self):
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.started) * 1000
+
+
+class ResultQueue:
+    """Finished AI results waiting for the game loop.
+
+    Tasks post a callable instead of touching game state; the game runs
+    drain() once per frame, so results land at one known point in update().
+    Posting with replace=True supersedes anything still queued under the
+    same key (only the newest taunt matters). Past max_depth the oldest
+    entry is dropped, or the new one if overflow="drop_newest". An entry's
+    discard callable, if given, runs instead of apply whenever the entry is
+    dropped, replaced or cleared, so the poster can undo its bookkeeping.
+    """
+
+    def __init__(self, max_depth=C.AI_RESULT_QUEUE_DEPTH, overflow="drop_oldest"):
+        self.items = deque()  # (key, apply, discard)
+        self.max_depth = max_depth
+        self.overflow = overflow
+        self.dropped = 0
+
+    def post(self, key, apply, replace=False, discard=None):
+        if replace:
+            kept = deque()
+            for item in self.items:
+                if item[0] == key:
+                    self._discard(item)
+                else:
+                    kept.append(item)
+            self.items = kept
+        item = (key, apply, discard)
+        if len(self.items) >= self.max_depth:
+            if self.overflow == "drop_newest":
+                self._discard(item)
+                return
+            self._discard(self.items.popleft())
+        self.items.append(item)
+
+    def _discard(self, item):
+        self.dropped += 1
+        if item[2] is not None:
+            item[2]()
+
+    def drain(self):
+        while self.items:
+            _, apply, _ = self.items.popleft()
+            apply()
+
+    def clear(self):
+        while self.items:
+            _, _, discard = self.items.popleft()
+            if discard is not None:
+                discard()
+
+
+class WorkerPool:
+    """A fixed set of daemon threads for blocking SDK calls.
+
+    Work waits in a bounded queue; once it is full, submit() fails the call
+    with Throttled rather than queueing without limit. The threads are
+    daemons and are never joined, so a call hung inside the SDK cannot hold
+    up interpreter exit (ThreadPoolExecutor joins its workers at exit).
+    Threads start on the first submit().
+    """
+
+    def __init__(self, workers=C.AI_WORKERS, max_queue=C.AI_WORKER_QUEUE, name="ai"):
+        self.workers = workers
+        self.name = name
+        self.jobs = queue.Queue(max_queue)  # (Future, func, args), or None to stop a thread
+        self.threads = []
+        self.closed = False
+
+    def submit(self, func, *args):
+        """Queues func(*args) and returns a concurrent.futures.Future for it."""
+        future = Future()
+        if self.closed:
+            future.set_exception(RuntimeError("worker pool closed"))
+            return future
+        if not self.threads:
+            self.threads = [threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+                            for i in range(self.workers)]
+            for thread in self.threads:
+                thread.start()
+        try:
+            self.jobs.put_nowait((future, func, args))
+        except queue.Full:
+            future.set_exception(Throttled("AI worker queue full"))
+        return future
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            future, func, args = job
+            if not future.set_running_or_notify_cancel():
+                continue  # Cancelled while queued
+            try:
+                result = func(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def close(self):
+        """Cancels queued calls and lets idle threads exit; never waits.
+
+        A call already running keeps its thread until the SDK returns, but
+        as a daemon thread it does not delay exit.
+        """
+        self.closed = True
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job[0].cancel()
+        for _ in self.threads:
+            try:
+                self.jobs.put_nowait(None)
+            except queue.Full:
+                break
+
+
+class AIGateway:
+    """The one place the game talks to Gemini.
+
+    - one shared backend (see ai_backends), so the SDK's HTTP connection is reused
+    - a deadline on every request (the caller gets its fallback, the frame never waits)
+    - a cap on concurrent requests
+    - a token bucket shared by every call, and a circuit breaker that backs off
+      on quota errors and outages; a held-back call fails with Throttled at
+      once, so callers get their fallback without waiting out a timeout
+    - single-flight: identical in-flight (model, prompt) pairs share one call
+    - cancel_all() drops every pending request when the game resets
+    - an optional ResponseCache answers repeated prompts from disk, and
+      covers for the network when a call fails
+
+    Calls run on a fixed pool of daemon worker threads (WorkerPool), so a
+    burst of triggers queues instead of starting threads; callers await them from tasks
+    started with spawn() and post what they got to `results`. stream()
+    returns a TextStream the game drains each frame instead, so text shows
+    as soon as the first chunk lands.
+    """
+
+    def __init__(self, backend, model=C.AI_MODEL, timeout=C.AI_TIMEOUT_SECONDS,
+                 max_concurrent=C.AI_MAX_CONCURRENT, cache=None, bucket=None, breaker=None):
+        if backend is not None and not isinstance(backend, AIBackend):
+            raise TypeError(f"AI backend needs generate() and stream(): {backend!r}")
+        self.backend = backend
+        self.cache = cache
+        self.bucket = bucket or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrent = max_concurrent
+        self._semaphore = None  # Bound to the running loop on first use
+        self._inflight = {}     # (model, prompt) -> asyncio.Task
+        self._tasks = set()     # Game-side tasks started through spawn()
+        self.workers = WorkerPool()
+        self.results = ResultQueue()
+        self.stream_latencies = deque(maxlen=50)  # (time to first chunk, total) in ms
+
+    @property
+    def available(self):
+        return self.backend is not None
+
+    def spawn(self, coro):
+        """Starts a game-side AI task that cancel_all() can stop."""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def cancel_all(self):
+        for task in list(self._tasks) + list(self._inflight.values()):
+            task.cancel()
+        self._tasks.clear()
+        self._inflight.clear()
+        self.results.clear()
+
+    def close(self):
+        """Cancels pending requests and closes the worker pool without waiting.
+
+        A call already inside the SDK is left to finish on its daemon
+        thread; it is not joined, so a hung request cannot block exit.
+        """
+        self.cancel_all()
+        self.workers.close()
+
+    def _run(self, func, *args):
+        return asyncio.wrap_future(self.workers.submit(func, *args))
+
+    async def generate(self, prompt, fallback, model=None, timeout=None, cache_as=None, bucket="",
+                       config=None, parse=None):
+        """Returns the response text, or the fallback on error, timeout or no backend.
+
+        fallback may be a string or a callable taking the exception. The
+        response is cached under (model, cache_as or prompt, bucket), so
+        prompts that embed live stats can share entries per stat bucket.
+        config is passed through to generate_content. If parse is given the
+        text is run through it and the parsed value returned; a response that
+        fails to parse counts as an error and is never cached.
+        """
+        if self.backend is None:
+            return fallback(None) if callable(fallback) else fallback
+        model = model or self.model
+        parse = parse or (lambda text: text)
+        cache_key = cache_as or prompt
+        if self.cache is not None:
+            cached = self.cache.get(model, cache_key, bucket)
+            if cached is not None:
+                try:
+                    return parse(cached)
+                except ValueError:
+                    pass  # Unusable entry; go to the network
+
+        key = (model, prompt)
+        call = self._inflight.get(key)
+        try:
+            if call is None:
+                self._admit()
+                call = asyncio.ensure_future(self._call(model, prompt, config))
+                self._inflight[key] = call
+                call.add_done_callback(lambda done: self._forget(key, done))
+            # shield: one caller's deadline must not cancel a call others share
+            text = await asyncio.wait_for(asyncio.shield(call), timeout or self.timeout)
+            result = parse(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.breaker.record_failure(e)
+            stale = self.cache.get_any(model, cache_key, bucket) if self.cache is not None else None
+            if stale is not None:
+                try:
+                    return parse(stale)
+                except ValueError:
+                    pass
+            return fallback(e) if callable(fallback) else fallback
+        if self.cache is not None:
+            self.cache.put(model, cache_key, bucket, text)
+        return result
+
+    async def generate_json(self, prompt, schema, fallback, parse=json.loads, **kwargs):
+        """generate() with a JSON response schema; returns the parsed value."""
+        config = {"response_mime_type": "application/json", "response_schema": schema}
+        return await self.generate(prompt, fallback, config=config, parse=parse, **kwargs)
+
+    def stream(self, prompt, model=None, cache_as=None, bucket=""):
+        """Starts a streamed call and returns its TextStream right away.
+
+        A cache hit arrives as one chunk on an already finished stream. The
+        concurrency cap applies, but there is no deadline or fallback here:
+        the caller watches the stream and decides when to give up.
+        """
+        model = model or self.model
+        cache_key = cache_as or prompt
+        stream = TextStream()
+        if self.backend is None:
+            stream.finish(RuntimeError("no AI backend"))
+            return stream
+        if self.cache is not None:
+            cached = self.cache.get(model, cache_key, bucket)
+            if cached is not None:
+                stream.push(cached)
+                stream.finish()
+                return stream
+        try:
+            self._admit()
+        except Throttled as e:
+            stale = self.cache.get_any(model, cache_key, bucket) if self.cache is not None else None
+            if stale is not None:
+                stream.push(stale)
+            stream.finish(e)
+            return stream
+        self.spawn(self._stream(stream, model, prompt, cache_key, bucket))
+        return stream
+
+    async def _stream(self, stream, model, prompt, cache_key, bucket):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        try:
+            async with self._semaphore:
+                await self._run(self._read_stream, stream, model, prompt)
+        except asyncio.CancelledError:
+            self.breaker.abandon()
+            stream.cancelled = True
+            stream.finish(asyncio.CancelledError())
+            raise
+        except Exception as e:
+            self.breaker.record_failure(e)
+            stale = self.cache.get_any(model, cache_key, bucket) if self.cache is not None else None
+            if stale is not None and not stream.parts:
+                stream.push(stale)
+            stream.finish(e)
+            return
+        if stream.cancelled:
+            # The caller gave up (e.g. its deadline); not a success to count or time
+            self.breaker.abandon()
+            return
+        self.breaker.record_success()
+        stream.finish()
+        self.stream_latencies.append((stream.ttfc_ms, stream.total_ms))
+        if self.cache is not None and stream.text:
+            self.cache.put(model, cache_key, bucket, stream.text)
+
+    def _read_stream(self, stream, model, prompt):
+        """Worker thread: pushes each chunk as the SDK yields it."""
+        for text in self.backend.stream(model, prompt):
+            if stream.cancelled:
+                return
+            if text:
+                stream.push(text)
+
+    def latency_lines(self):
+        """p50/max time-to-first-chunk and total for recent streams, for the F3 overlay."""
+        timings = [t for t in self.stream_latencies if t[0] is not None]
+        if not timings:
+            return []
+        first = sorted(t[0] for t in timings)
+        total = sorted(t[1] for t in timings)
+        mid = len(timings) // 2
+        return [f"{'AI STREAM':<14}{'p50':>7}{'max':>7}  ms (n={len(timings)})",
+                f"{'first chunk':<14}{first[mid]:>7.0f}{first[-1]:>7.0f}",
+                f"{'total':<14}{total[mid]:>7.0f}{total[-1]:>7.0f}"]
+
+    def _admit(self):
+        """Takes a token for one network call, or raises Throttled."""
+        if not self.bucket.ready():
+            raise Throttled("rate limited")
+        if not self.breaker.allow():
+            raise Throttled(f"circuit open, retry in {self.breaker.retry_in():.0f}s")
+        self.bucket.try_acquire()
+
+    def _forget(self, key, call):
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+        if not call.cancelled():
+            call.exception()  # Mark retrieved so abandoned calls don't log warnings
+
+    async def _call(self, model, prompt, config=None):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        async with self._semaphore:
+            try:
+                text = await self._run(self.backend.generate, model, prompt, config)
+            except asyncio.CancelledError:
+                self.breaker.abandon()
+                raise
+            except Exception as e:
+                self.breaker.record_failure(e)
+                raise
+        self.breaker.record_success()
+        return text
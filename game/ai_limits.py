@@ -0,0 +1,137 @@
+import random
+import re
+import time
+import constants as C
+
+# "retryDelay": "27s" in Gemini error bodies, or "retry in 27.3s" in the message
+RETRY_DELAY_RE = re.compile(r"retry(?:Delay['\"]?\s*[:=]\s*['\"]?| in |_delay\s*\{\s*seconds:\s*)(\d+(?:\.\d+)?)", re.I)
+
+
+class Throttled(Exception):
+    """Raised in place of a call the rate limiter or circuit breaker held back."""
+
+
+def is_quota_error(error):
+    """True for Gemini 429 / RESOURCE_EXHAUSTED errors from either SDK."""
+    if error is None:
+        return False
+    code = getattr(error, "code", None)
+    if code is None:
+        code = getattr(error, "status_code", None)
+    # google.genai APIError has code=429; google.api_core ResourceExhausted has code=HTTPStatus(429)
+    if code == 429:
+        return True
+    return getattr(error, "status", None) == "RESOURCE_EXHAUSTED"
+
+
+def retry_after_seconds(error):
+    """The server's retry hint in seconds (Retry-After header or retryDelay), or None."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+    match = RETRY_DELAY_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, with bursts up to `capacity`."""
+
+    def __init__(self, rate=C.AI_REQUESTS_PER_MINUTE / 60, capacity=C.AI_BURST, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready(self):
+        """True if a call could go out now (does not take a token)."""
+        self._refill()
+        return self.tokens >= 1
+
+    def try_acquire(self):
+        self._refill()
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class CircuitBreaker:
+    """Stops calling a degraded service until it has had time to recover.
+
+    CLOSED: calls go through. A quota error, or `threshold` failures in a
+    row, trips the breaker OPEN for the server's retry hint or an
+    exponential backoff with jitter. Once that passes it is HALF_OPEN: one
+    probe call is let through; success closes it, failure re-opens it with
+    a doubled backoff.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, threshold=C.AI_FAILURES_TO_OPEN, base_backoff=C.AI_BACKOFF_BASE_SECONDS,
+                 max_backoff=C.AI_BACKOFF_MAX_SECONDS, clock=time.monotonic):
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0       # Consecutive failures while closed
+        self.trips = 0          # Consecutive openings, drives the backoff
+        self.open_until = 0.0
+        self.probing = False
+
+    def allow(self):
+        if self.state == self.OPEN:
+            if self.clock() < self.open_until:
+                return False
+            self.state = self.HALF_OPEN
+            self.probing = False
+        if self.state == self.HALF_OPEN:
+            if self.probing:
+                return False
+            self.probing = True
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.probing = False
+
+    def abandon(self):
+        """A call ended without an answer (e.g. cancelled); lets the next one probe."""
+        self.probing = False
+
+    def record_failure(self, error=None):
+        if self.state == self.OPEN:
+            return  # A call sent before the trip; the backoff already covers it
+        self.failures += 1
+        if self.state == self.HALF_OPEN or is_quota_error(error) or self.failures >= self.threshold:
+            self.trip(retry_after_seconds(error))
+
+    def trip(self, retry_after=None):
+        self.trips += 1
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.trips - 1))
+        delay = random.uniform(backoff / 2, backoff)  # Jitter so restarts don't retry in lockstep
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.state = self.OPEN
+        self.open_until = self.clock() + delay
+        self.failures = 0
+        self.probing = False
+
+    def retry_in(self):
+        """Seconds until the next call is allowed (0 when closed)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.open_until - self.clock())
@@ -1,3 +1,4 @@
+import os
 import pygame
 
 # --- Window Settings ---
@@ -10,6 +11,7 @@ TILE_SIZE = 40  # Everything in the game will be on a 40x40 grid
 # Using HEX codes for that "Terminal" look
 BG_COLOR = (10, 15, 20)          # Deep Midnight
 GRID_COLOR = (20, 30, 40)        # Subtle Grid lines
+PATH_COLOR = (18, 34, 44)        # Virus data-lane
 TEXT_COLOR = (0, 255, 150)       # Terminal Green
 ACCENT_COLOR = (0, 229, 255)     # Cyber Cyan
 
@@ -31,15 +33,67 @@ LOCAL_LORE_BACKUP = [
     "PROTOCOL_ALPHA: Security cycles low. Expect heavy packet loss."
 ]
 
+# --- LEADERBOARD ---
+# POST endpoint of app.py (e.g. https://<host>/api/scores); unset means scores stay local
+SCORES_URL = os.environ.get("SENTINEL_SCORES_URL")
+PLAYER_NAME = os.environ.get("SENTINEL_PLAYER", "SENTINEL")
+SCORES_TIMEOUT_SECONDS = 3
+
+# --- Gemini ---
+AI_MODEL = "gemini-2.0-flash"
+# "gemini" uses the SDK client; "sim:<profile>" the local stand-in (profiles in ai_backends.SIM_PROFILES)
+AI_BACKEND = os.environ.get("SENTINEL_AI_BACKEND", "gemini")
+AI_TIMEOUT_SECONDS = 8      # Per-request deadline before the local fallback is used
+AI_STREAM_TIMEOUT_SECONDS = 20  # Whole streamed advice reply, first chunk included
+AI_MAX_CONCURRENT = 2       # Requests allowed in flight at once
+AI_WORKERS = 4              # Fixed worker threads; calls abandoned at their deadline may still hold one
+AI_WORKER_QUEUE = 16        # Calls waiting for a worker before new ones are refused
+AI_RESULT_QUEUE_DEPTH = 16  # Finished results waiting for the next frame
+AI_REQUESTS_PER_MINUTE = 10 # Shared by lore, advice and taunts (free tier allows 15)
+AI_BURST = 3                # Calls that may go out back to back
+AI_FAILURES_TO_OPEN = 3     # Failures in a row before the circuit breaker opens
+AI_BACKOFF_BASE_SECONDS = 5
+AI_BACKOFF_MAX_SECONDS = 300
+
+WAVE_INTEL_PROMPT = ("Invent intel for {count} consecutive computer virus waves ({first} to {last}) "
+                     "attacking a firewall. For each wave give a short virus name, a threat_level "
+                     "and one short, gritty lore sentence.")
+LORE_PREFETCH_DEPTH = 3     # Upcoming waves whose lore is generated ahead of time
+LORE_BATCH_SIZE = 5         # Waves of lore/threat/name per Gemini request
+
+# On-disk response cache (desktop only)
+AI_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ai_cache.sqlite3")
+AI_CACHE_TTL_SECONDS = 7 * 24 * 3600
+AI_CACHE_MAX_ENTRIES = 500
+AI_CACHE_VARIANTS = 5       # Distinct texts collected per prompt before serving from cache
+VICTORY_PROMPT = "The firewall has failed. Act as a victorious computer virus. 1-sentence message."
+VICTORY_FALLBACK = "CORE_TERMINATED: ALL DATA BELONGS TO THE HIVE."
+LOCAL_ADVICE_BACKUP = [
+    "ADVICE: Conserve cycles for high-density virus waves.",
+    "ADVICE: Overlapping tower ranges maximize efficiency.",
+    "ADVICE: Prioritize nodes for fast moving packets."
+]
+
 # The virus enters at (0, 100), moves across, and ends at the Core
 # Waypoints are defined in (x, y) pixels
 ENEMY_PATH = [(0, 100), (400, 100), (400, 400), (800, 400), (800, 200), (1200, 200)]
+PATH_WIDTH = 40         # Pixels, drawn into the static background layer
+SHOW_GRID = True
 
 # --- Tower Settings ---
 TOWER_RANGE = 150       # Pixels
 TOWER_COOLDOWN = 1000   # Milliseconds (1 second between shots)
 PROJECTILE_SPEED = 7
 
+# --- Performance ---
+# "sprite": one Enemy sprite per virus. "numpy": EnemySwarm arrays (desktop only)
+ENEMY_BACKEND = "sprite"
+# Repaint only changed regions with display.update(rects) instead of full flips
+DIRTY_RECTS = False
+# Frame profiler: F3 toggles the overlay; set a .csv/.json path to export on quit
+PROFILER_FRAMES = 600
+PROFILE_EXPORT_PATH = None
+
 # --- System Integrity ---
 MAX_INTEGRITY = 100
 CORE_POS = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
@@ -1,6 +1,44 @@
 import pygame
 import math
-import constants as C
+from path import ENEMY_PATH
+
+
+class WaveArchetype:
+    """Stats and sprite shared by every enemy of one wave (flyweight)."""
+
+    __slots__ = ("wave_num", "speed", "max_hp", "size", "color", "image")
+
+    def __init__(self, wave_num):
+        self.wave_num = wave_num
+        # Speed: Starts at 2, increases by 0.2 every wave (cap at 6 for playability)
+        self.speed = min(2 + (wave_num * 0.2), 6)
+        # Health: If you have a health system, scale it here
+        self.max_hp = 10 + (wave_num * 5)
+
+        # Make enemies slightly more red or larger as waves progress
+        self.size = min(24 + wave_num, 40)
+        # Shift color towards red as difficulty increases
+        red_intensity = min(100 + (wave_num * 10), 255)
+        self.color = (red_intensity, 50, 50)
+
+        # Enemies never draw onto their own image, so one surface serves the whole wave
+        self.image = pygame.Surface((self.size, self.size))
+        self.image.fill(self.color)
+
+
+_ARCHETYPES = {}
+_ARCHETYPE_LIMIT = 16  # Only the current wave (and a straggler or two) is ever live
+
+
+def archetype_for(wave_num):
+    """Returns the cached WaveArchetype for wave_num, building it on first use."""
+    archetype = _ARCHETYPES.get(wave_num)
+    if archetype is None:
+        if len(_ARCHETYPES) >= _ARCHETYPE_LIMIT:
+            _ARCHETYPES.pop(next(iter(_ARCHETYPES)))
+        archetype = _ARCHETYPES[wave_num] = WaveArchetype(wave_num)
+    return archetype
+
 
 class Enemy(pygame.sprite.Sprite):
     # def __init__(self):
@@ -17,50 +55,50 @@ class Enemy(pygame.sprite.Sprite):
     #     self.speed = 2
     #     self.reached_end = False
 
-    def __init__(self, wave_num=1):  # 1. Accept wave_num (default to 1)
+    def __init__(self, wave_num=1, grid=None, path=ENEMY_PATH):  # 1. Accept wave_num (default to 1)
         super().__init__()
-        self.path = C.ENEMY_PATH
-        self.waypoints = iter(self.path)
-        self.target_waypoint = next(self.waypoints)
+        # Position is derived from a single scalar along the precomputed path
+        self.path = path
+        self.distance = 0.0
         self.max_health = 3  # Takes 3 hits to kill
         self.health = self.max_health
         
-        # 2. Scaling Stats based on Wave
-        # Speed: Starts at 2, increases by 0.2 every wave (cap at 6 for playability)
-        self.speed = min(2 + (wave_num * 0.2), 6)
-        
-        # Health: If you have a health system, scale it here
-        self.max_hp = 10 + (wave_num * 5)
+        # 2. Scaling Stats and 3. Visual Feedback come from the per-wave archetype
+        archetype = archetype_for(wave_num)
+        self.speed = archetype.speed
+        self.max_hp = archetype.max_hp
         self.hp = self.max_hp
-
-        # 3. Visual Feedback (Optional 2026 Polish)
-        # Make enemies slightly more red or larger as waves progress
-        size = min(24 + wave_num, 40) 
-        self.image = pygame.Surface((size, size))
+        self.image = archetype.image
         
-        # Shift color towards red as difficulty increases
-        red_intensity = min(100 + (wave_num * 10), 255)
-        self.image.fill((red_intensity, 50, 50)) 
-        
-        self.rect = self.image.get_rect(center=self.target_waypoint)
-        self.pos = pygame.Vector2(self.rect.center)
+        self.rect = self.image.get_rect(center=path.position_at(0))
         self.reached_end = False
 
+        # Optional SpatialGrid that towers query for targets
+        self.grid = grid
+        if grid is not None:
+            grid.insert(self)
+
     # Inside enemy.py -> Enemy class -> update()
     def update(self):
-        target_vec = pygame.Vector2(self.target_waypoint)
-        # Change 'direction' to 'self.direction'
-        self.direction = target_vec - self.pos
-        
-        if self.direction.length() > self.speed:
-            self.direction = self.direction.normalize() 
-            self.pos += self.direction * self.speed
-            self.rect.center = (round(self.pos.x), round(self.pos.y))
-        else:
-            try:
-                self.target_waypoint = next(self.waypoints)
-            except StopIteration:
-                self.reached_end = True
+        self.distance += self.speed
+        if self.distance >= self.path.length:
+            self.distance = self.path.length
+            self.reached_end = True
+
+        x, y = self.path.position_at(self.distance)
+        self.rect.center = (round(x), round(y))
+        if self.grid is not None:
+            self.grid.move(self)
+
+    @property
+    def progress(self):
+        """How far along the path this virus is, from 0.0 to 1.0."""
+        return self.path.progress(self.distance)
+
+    def kill(self):
+        if self.grid is not None:
+            self.grid.remove(self)
+        super().kill()
     # def update(self):
     #     # Move toward target
     #     target_vec = pygame.Vector2(self.target_waypoint)
@@ -97,4 +135,5 @@ class Enemy(pygame.sprite.Sprite):
             current_health_width = bar_width * health_ratio
             
             # 3. Draw the Foreground (Green - representing remaining health)
-            pygame.draw.rect(surface, (0, 255, 0), (bar_x, bar_y, current_health_width, bar_height))
\ No newline at end of file
+            pygame.draw.rect(surface, (0, 255, 0), (bar_x, bar_y, current_health_width, bar_height))
+            return pygame.Rect(bar_x, bar_y, bar_width, bar_height)
\ No newline at end of file
@@ -0,0 +1,129 @@
+import json
+import random
+from collections import deque
+from typing import NamedTuple
+import constants as C
+
+THREAT_LEVELS = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+# Gemini response schema for one batch of wave intel
+WAVE_INTEL_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "name": {"type": "STRING"},
+            "threat_level": {"type": "STRING", "enum": THREAT_LEVELS},
+            "lore": {"type": "STRING"},
+        },
+        "required": ["name", "threat_level", "lore"],
+    },
+}
+
+
+class WaveIntel(NamedTuple):
+    wave: int
+    name: str
+    threat_level: str
+    lore: str
+
+
+def local_threat(wave):
+    return THREAT_LEVELS[min(wave // 10, len(THREAT_LEVELS) - 1)]
+
+
+def local_intel(wave):
+    return WaveIntel(wave, "UNKNOWN_STRAIN", local_threat(wave), random.choice(C.LOCAL_LORE_BACKUP))
+
+
+def parse_wave_intel(text, first_wave, count):
+    """Validates a batch response into WaveIntel for waves first_wave.. (ValueError if unusable).
+
+    Waves are numbered by position, not by anything the model wrote, so a
+    cached batch can be reused for a different stretch of waves.
+    """
+    items = json.loads(text)
+    if not isinstance(items, list):
+        raise ValueError("wave intel batch is not a list")
+    intel = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        name, lore = item.get("name"), item.get("lore")
+        if not (isinstance(name, str) and name.strip() and isinstance(lore, str) and lore.strip()):
+            continue
+        wave = first_wave + len(intel)
+        threat = item.get("threat_level")
+        if threat not in THREAT_LEVELS:
+            threat = local_threat(wave)
+        intel.append(WaveIntel(wave, name.strip(), threat, lore.strip()))
+        if len(intel) == count:
+            break
+    if not intel:
+        raise ValueError("wave intel batch had no valid entries")
+    return intel
+
+
+class LorePrefetcher:
+    """Generates intel for upcoming waves in the background, K waves per request.
+
+    While wave N is played, intel reaching at least N+depth is already being
+    fetched as one structured JSON batch, so a wave transition just pops a
+    ready entry. The local backup is only used when nothing has arrived yet.
+    """
+
+    def __init__(self, gateway, depth=C.LORE_PREFETCH_DEPTH, batch_size=C.LORE_BATCH_SIZE):
+        self.gateway = gateway
+        self.depth = depth
+        self.batch_size = batch_size
+        self.ready = deque()   # WaveIntel, oldest first
+        self.pending = {}      # First wave of an in-flight batch -> last wave
+
+    def covered_until(self):
+        last = [intel.wave for intel in self.ready] + list(self.pending.values())
+        return max(last) if last else 0
+
+    def fill(self, current_wave):
+        """Requests batches until waves up to current_wave + depth are ready or pending."""
+        if not self.gateway.available:
+            return
+        target = current_wave + self.depth - 1
+        while self.covered_until() < target:
+            first = max(current_wave, self.covered_until() + 1)
+            last = first + self.batch_size - 1
+            self.pending[first] = last
+            self.gateway.spawn(self._fetch(first))
+
+    async def _fetch(self, first):
+        count = self.batch_size
+        posted = False
+        try:
+            # Wave range in the prompt keeps single-flight from merging batches
+            prompt = C.WAVE_INTEL_PROMPT.format(count=count, first=first, last=first + count - 1)
+            intel = await self.gateway.generate_json(
+                prompt, WAVE_INTEL_SCHEMA, fallback=None,
+                parse=lambda text: parse_wave_intel(text, first, count),
+                cache_as=C.WAVE_INTEL_PROMPT, bucket=f"wave>={first // 10 * 10}")
+            if intel:
+                # The batch stays pending until it is ready, so fill() can't re-request it in between
+                def land():
+                    self.pending.pop(first, None)
+                    self.ready.extend(intel)
+                self.gateway.results.post("lore", land, discard=lambda: self.pending.pop(first, None))
+                posted = True
+        finally:
+            if not posted:
+                self.pending.pop(first, None)
+
+    def take(self, wave):
+        """Intel for `wave` without waiting: its own entry, any ready one, or a local line."""
+        # Entries for waves already behind us are dropped, not replayed
+        while self.ready and self.ready[0].wave < wave and len(self.ready) > 1:
+            self.ready.popleft()
+        for intel in self.ready:
+            if intel.wave == wave:
+                self.ready.remove(intel)
+                return intel
+        if self.ready:
+            return self.ready.popleft()._replace(wave=wave)
+        return local_intel(wave)
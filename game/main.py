@@ -1,10 +1,11 @@
 import asyncio
 import pygame
 import os
+import json
+import time
 import random
-import textwrap
+import urllib.request
 import importlib
-import threading
 
 # --- THE GHOST LAYER ---
 WEB_MODE = os.path.exists('/dev/canvas') or os.path.exists('/home/webuser')
@@ -25,6 +26,20 @@ try:
     C = importlib.import_module("constants")
     Enemy = importlib.import_module("enemy").Enemy
     Tower = importlib.import_module("tower").Tower
+    Simulation = importlib.import_module("simulation").Simulation
+    render = importlib.import_module("render")
+    DirtyRenderer = render.DirtyRenderer
+    StaticLayer = render.StaticLayer
+    text_cache = importlib.import_module("text_cache")
+    FrameProfiler = importlib.import_module("profiler").FrameProfiler
+    ai_gateway = importlib.import_module("ai_gateway")
+    AIGateway = ai_gateway.AIGateway
+    ai_backends = importlib.import_module("ai_backends")
+    ai_limits = importlib.import_module("ai_limits")
+    is_quota_error = ai_limits.is_quota_error
+    Throttled = ai_limits.Throttled
+    LorePrefetcher = importlib.import_module("lore").LorePrefetcher
+    ResponseCache = importlib.import_module("ai_cache").ResponseCache
 except ImportError as e:
     print(f"Critical Module Load Failure: {e}")
 
@@ -34,16 +49,27 @@ class GameApp:
         self.screen = pygame.display.set_mode((C.SCREEN_WIDTH, C.SCREEN_HEIGHT))
         pygame.display.set_caption("SENTINEL.EXE | AI Firewall")
         self.font = pygame.font.SysFont(None, 24)
+        self.text_cache = text_cache.TextCache()
         self.clock = pygame.time.Clock()
 
-        self.core_rect = pygame.Rect(1280//2-20, 720//2-20, 40, 40)
-        
-        # Stats
-        self.cycles = 100
-        self.integrity = C.MAX_INTEGRITY
-        self.game_over = False
+        # Per-phase frame timings; F3 shows them
+        self.profiler = FrameProfiler(C.PROFILER_FRAMES)
+        self.showing_profiler = False
+        self.profiler_lines = []
+        self.mono_font = pygame.font.SysFont("monospace", 16)
+
+        # Game rules (stats, waves, sprite groups) live in the headless simulation
+        self.sim = Simulation(on_wave_end=self.end_wave, on_game_over=self.on_game_over,
+                              profiler=self.profiler)
+        self.static_layer = StaticLayer()
+        self.renderer = DirtyRenderer(self) if C.DIRTY_RECTS else None
         
         # AI & State Management
+        # Every Gemini call goes through one gateway; no backend on Web
+        backend = None if WEB_MODE else ai_backends.backend_from_setting(C.AI_BACKEND, client)
+        self.ai = AIGateway(backend, cache=self.open_response_cache())
+        self.lore = LorePrefetcher(self.ai)
+        self.wave_intel = None
         self.state = "START_MENU" 
         self.lore_text = "Press SPACE to initialize Firewall Lore..."
         self.virus_taunt = ""
@@ -53,201 +79,204 @@ class GameApp:
         self.showing_advice = False
         self.latest_advice = ""
         self.advice_timer = 0
-        self.last_ai_request_time = 0
-
-        # Sprite Groups
-        self.enemies = pygame.sprite.Group()
-        self.towers = pygame.sprite.Group()
-        self.projectiles = pygame.sprite.Group()
-
-        # Wave-tracking
-        self.wave = 1
-        self.enemies_spawned_this_wave = 0
-        self.max_enemies_this_wave = 5 
-        self.wave_active = True
-     
-        self.spawn_timer = 0
-        self.score = 0
-        self.flash_timer = 0
+        self.advice_stream = None
+        self.advice_chunks = 0
 
     # --- AI LOGIC (ASYNC & NON-BLOCKING) ---
-    async def fetch_wave_lore(self):
-        """Async lore fetch: Uses threads on Desktop, local backup on Web."""
-        self.state = "AI_LOADING"
-        # 1. Guard for Web or Missing Client
-        if WEB_MODE or client is None: 
-            self.lore_text = random.choice(C.LOCAL_LORE_BACKUP)
-        else:
-            try:
-                def call_api():
-                    prompt = "Describe a computer virus wave in one short, gritty sentence."
-                    # Ensure you use the correct SDK method here
-                    return client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
-                
-                response = await asyncio.to_thread(call_api)
-                self.lore_text = response.text
-            except Exception:
-                self.lore_text = random.choice(C.LOCAL_LORE_BACKUP)
-        
-        self.state = "PLAYING"
+    def open_response_cache(self):
+        """SQLite response cache on Desktop; None on Web, with the stand-in backend, or if the file can't be opened."""
+        if WEB_MODE or client is None or C.AI_BACKEND != "gemini":
+            return None
+        try:
+            return ResponseCache()
+        except Exception as e:
+            print(f"AI cache disabled: {e}")
+            return None
+
+    def fetch_wave_lore(self, wave):
+        """Takes prefetched intel for this wave (never waits) and queues the next ones."""
+        self.wave_intel = self.lore.take(wave)
+        self.lore_text = self.wave_intel.lore
+        self.lore.fill(wave + 1)
 
     def fetch_ai_advice(self):
-        """Guarded thread creation for Desktop only."""
-        if WEB_MODE or client is None:
+        """Local tip on Web, otherwise a streamed request whose chunks fill the overlay as they land."""
+        if not self.ai.available:
             self.latest_advice = random.choice(C.LOCAL_LORE_BACKUP)
             self.showing_advice = True
             self.advice_timer = pygame.time.get_ticks()
-            return # <--- IMPORTANT: Exit before touching 'threading'
+            return
 
         if not self.showing_advice:
             self.latest_advice = "ACCESSING TACTICAL ADVISOR..."
             self.showing_advice = True
-            # Only desktop reaches here
-            thread = threading.Thread(target=self._get_gemini_advice_thread)
-            thread.daemon = True
-            thread.start()
-
-    def _get_gemini_advice_thread(self):
-        try:
-            stats = f"Integrity: {self.integrity}%, Cycles: {self.cycles}"
+            self.advice_timer = 0
+            stats = f"Integrity: {self.sim.integrity}%, Cycles: {self.sim.cycles}"
             prompt = f"Cyber-defense context. Stats: {stats}. 1-sentence tip."
-            response = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
-            self.latest_advice = response.text
-        except Exception as e:
-            if "429" in str(e):
-                self.latest_advice = random.choice([
-                    "ADVICE: Conserve cycles for high-density virus waves.",
-                    "ADVICE: Overlapping tower ranges maximize efficiency.",
-                    "ADVICE: Prioritize nodes for fast moving packets."
-                ])
-            else:
-                self.latest_advice = "AI_OFFLINE: Connection interrupted."
-        self.advice_timer = pygame.time.get_ticks()
+            # Tips are shared between games in the same rough situation
+            bucket = f"integrity>={int(self.sim.integrity) // 25 * 25},cycles>={min(self.sim.cycles // 100 * 100, 500)}"
+            self.advice_stream = self.ai.stream(prompt, cache_as="advice", bucket=bucket)
+
+    def pump_advice_stream(self):
+        """Moves streamed advice chunks into the overlay; called once per frame."""
+        stream = self.advice_stream
+        if stream is None:
+            return
+        # Read done first: once it is set, every chunk is already queued
+        finished = stream.done
+        text = stream.drain()
+        if text:
+            if self.advice_chunks == 0:
+                self.latest_advice = ""  # First chunk replaces the "ACCESSING" line
+            self.latest_advice += text
+            self.advice_chunks += 1
+        if not finished:
+            # Both deadlines count from the request, so a stream that stalls mid-reply ends too
+            waited = time.perf_counter() - stream.started
+            if waited > C.AI_STREAM_TIMEOUT_SECONDS or (stream.first_chunk_at is None and waited > self.ai.timeout):
+                stream.cancelled = True
+                stream.finish(TimeoutError("stream missed its deadline"))
+                finished = True
+
+        if finished:
+            if self.advice_chunks == 0:
+                # Quota trouble or a held-back call: a local tip, not an error line
+                if stream.error is None or isinstance(stream.error, Throttled) or is_quota_error(stream.error):
+                    self.latest_advice = random.choice(C.LOCAL_ADVICE_BACKUP)
+                else:
+                    self.latest_advice = "AI_OFFLINE: Connection interrupted."
+            self.advice_stream = None
+            self.advice_chunks = 0
+            self.advice_timer = pygame.time.get_ticks()
 
     def fetch_victory_message(self):
-        """Guarded thread creation for Desktop only."""
-        if WEB_MODE or client is None:
-            self.virus_taunt = "CORE_TERMINATED: ALL DATA BELONGS TO THE HIVE."
-            return
+        """Taunt through the gateway; the fixed line on Web or failure."""
+        self.ai.spawn(self._get_victory_message())
 
-        def thread_target():
-            try:
-                prompt = "The firewall has failed. Act as a victorious computer virus. 1-sentence message."
-                response = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
-                self.virus_taunt = response.text
-            except Exception:
-                self.virus_taunt = "CORE_TERMINATED: ALL DATA BELONGS TO THE HIVE."
-        
-        threading.Thread(target=thread_target, daemon=True).start()
+    async def _get_victory_message(self):
+        taunt = await self.ai.generate(C.VICTORY_PROMPT, fallback=C.VICTORY_FALLBACK)
+        self.ai.results.post("taunt", lambda: setattr(self, "virus_taunt", taunt), replace=True)
 
     # --- CORE LOOP (UPDATED FOR ASYNC) ---
 
     async def run(self):
         running = True
+        frame_count = 0
+        # Start generating wave lore while the player reads the menu
+        self.lore.fill(self.sim.wave)
         while running:
             dt = self.clock.tick(C.FPS)
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE and self.state == "START_MENU":
-                        # We use 'create_task' so the lore fetches while the game keeps drawing
-                        asyncio.create_task(self.fetch_wave_lore())
-                    
-                    if event.key == pygame.K_r and self.state == "GAME_OVER":
-                        self.reset_game()
-                    
-                    if event.key == pygame.K_h and self.state == "PLAYING":
-                        current_time = pygame.time.get_ticks()
-                        if current_time - self.last_ai_request_time > 15000:
-                            self.fetch_ai_advice()
-                            self.last_ai_request_time = current_time
-                        else:
-                            self.latest_advice = "TACTICAL COOLDOWN: Wait for re-sync..."
-                            self.showing_advice = True
-                            self.advice_timer = pygame.time.get_ticks()
-                   
-                if event.type == pygame.MOUSEBUTTONDOWN and self.state == "PLAYING" and not self.game_over:
-                    mouse_pos = pygame.mouse.get_pos()
-                    self.attempt_place_tower(mouse_pos)
+            with self.profiler.phase("events"):
+                running = self.handle_events()
     
             self.update(dt)
-            self.draw()
+            with self.profiler.phase("draw"):
+                dirty_rects = self.draw()
+
+            with self.profiler.phase("flip"):
+                if dirty_rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty_rects)
+            self.profiler.end_frame()
+
+            # Percentiles are re-sorted twice a second, not every frame
+            frame_count += 1
+            if self.showing_profiler and frame_count % 30 == 0:
+                self.profiler_lines = self.profiler.overlay_lines() + self.ai.latency_lines()
 
-            pygame.display.flip()
             # CRITICAL: This line allows the browser to process events
             await asyncio.sleep(0) 
 
+        self.ai.close()
+        if C.PROFILE_EXPORT_PATH:
+            self.profiler.export(C.PROFILE_EXPORT_PATH)
         pygame.quit()
 
+    def handle_events(self):
+        """Processes the event queue. Returns False once the window is closed."""
+        running = True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.showing_profiler = not self.showing_profiler
+                    self.profiler_lines = self.profiler.overlay_lines() + self.ai.latency_lines()
+
+                if event.key == pygame.K_SPACE and self.state == "START_MENU":
+                    # Lore was prefetched while the menu was up
+                    self.fetch_wave_lore(self.sim.wave)
+                    self.state = "PLAYING"
+                
+                if event.key == pygame.K_r and self.state == "GAME_OVER":
+                    self.reset_game()
+                
+                if event.key == pygame.K_h and self.state == "PLAYING":
+                    # The gateway's shared rate limit is the cooldown
+                    if not self.ai.available or self.ai.bucket.ready():
+                        self.fetch_ai_advice()
+                    elif self.advice_stream is None:
+                        self.latest_advice = "TACTICAL COOLDOWN: Wait for re-sync..."
+                        self.showing_advice = True
+                        self.advice_timer = pygame.time.get_ticks()
+               
+            if event.type == pygame.MOUSEBUTTONDOWN and self.state == "PLAYING" and not self.sim.game_over:
+                mouse_pos = pygame.mouse.get_pos()
+                self.attempt_place_tower(mouse_pos)
+        return running
+
     def attempt_place_tower(self, pos):
-        if self.cycles >= C.TOWER_COST:
-            new_tower = Tower(pos[0], pos[1])
-            if not pygame.sprite.spritecollideany(new_tower, self.towers):
-                self.towers.add(new_tower)
-                self.cycles -= C.TOWER_COST
-            else:
+        if self.sim.can_afford_tower():
+            if not self.sim.place_tower(pos):
                 print("PLACEMENT BLOCKED")
         else:
             self.fetch_ai_advice()
 
     def update(self, dt):
-        if self.state == "PLAYING" and not self.game_over:
-            self.spawn_timer += dt
-            if self.spawn_timer > 1500 and self.enemies_spawned_this_wave < self.max_enemies_this_wave:
-                self.enemies.add(Enemy(wave_num=self.wave))
-                self.enemies_spawned_this_wave += 1
-                self.spawn_timer = 0
-
-            if self.enemies_spawned_this_wave >= self.max_enemies_this_wave and len(self.enemies) == 0:
-                self.end_wave()
-            
-            self.enemies.update()
-            self.towers.update(self.enemies, self.projectiles)
-            self.projectiles.update()
-            
-            # Collisions
-            hits = pygame.sprite.groupcollide(self.enemies, self.projectiles, False, True)
-            if hits:
-                for enemy_hit in hits:
-                    enemy_hit.health -= 1
-                    if enemy_hit.health <= 0:
-                        enemy_hit.kill()
-                        self.cycles += C.REWARD_PER_VIRUS
-                        self.score += 1
-           
-            for enemy in self.enemies:
-                if enemy.rect.colliderect(self.core_rect):
-                    self.integrity -= 0.1 
-                    if pygame.time.get_ticks() % 500 < 20: 
-                        self.flash_timer = pygame.time.get_ticks()
-                if enemy.reached_end:
-                    self.integrity -= 10
-                    enemy.kill()
-            
-            if self.integrity <= 0:
-                self.integrity = 0
-                self.game_over = True
-                self.state = "GAME_OVER"
-                if not self.ai_called_end:
-                    self.fetch_victory_message()
-                    self.ai_called_end = True
+        # AI results are applied here, on the main thread, once per frame
+        self.ai.results.drain()
+        if self.state == "PLAYING" and not self.sim.game_over:
+            self.sim.step(dt)
+            self.pump_advice_stream()
 
             if self.showing_advice and self.advice_timer != 0:
                 if pygame.time.get_ticks() - self.advice_timer > 5000:
                     self.showing_advice = False
 
-    def end_wave(self):
-        self.wave += 1
-        self.enemies_spawned_this_wave = 0
-        self.max_enemies_this_wave += 2 
-        self.cycles += 50  
-        asyncio.create_task(self.fetch_wave_lore())
+    def on_game_over(self):
+        self.state = "GAME_OVER"
+        if not self.ai_called_end:
+            self.fetch_victory_message()
+            self.post_score()
+            self.ai_called_end = True
+
+    def post_score(self):
+        """Sends the final run to the leaderboard on the AI worker pool; never waits for it."""
+        if WEB_MODE or not C.SCORES_URL:
+            return
+        entry = {"name": C.PLAYER_NAME, "score": int(self.sim.score), "wave": int(self.sim.wave),
+                 "integrity": max(0, int(self.sim.integrity))}
+        upload = self.ai.workers.submit(self._send_score, entry)
+        if upload.done() and upload.exception() is not None:  # Pool closed or its queue full
+            print(f"Score upload failed: {upload.exception()}")
+
+    @staticmethod
+    def _send_score(entry):
+        request = urllib.request.Request(C.SCORES_URL, data=json.dumps(entry).encode(),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            urllib.request.urlopen(request, timeout=C.SCORES_TIMEOUT_SECONDS).close()
+        except Exception as e:
+            print(f"Score upload failed: {e}")
+
+    def end_wave(self, wave):
+        self.fetch_wave_lore(wave)
 
     def draw_text_overlay(self, text, color=C.ACCENT_COLOR):
-        if not text: return
+        if not text: return None
         padding = 20
         rect_width = C.SCREEN_WIDTH - (padding * 2)
         overlay_rect = pygame.Rect(padding, C.SCREEN_HEIGHT - 120, rect_width, 100)
@@ -255,69 +284,105 @@ class GameApp:
         pygame.draw.rect(self.screen, color, overlay_rect, 2)  
 
         max_chars = max(1, rect_width // 10) 
-        wrapped_lines = textwrap.wrap(text, width=max_chars)
+        wrapped_lines = text_cache.wrap_lines(text, max_chars)
         for i, line in enumerate(wrapped_lines):
             y_offset = overlay_rect.y + 15 + (i * 25)
             if y_offset > overlay_rect.bottom - 20: break
-            line_surf = self.font.render(line, True, C.TEXT_COLOR)
+            line_surf = self.render_text(line, C.TEXT_COLOR)
             self.screen.blit(line_surf, (overlay_rect.x + 10, y_offset))
+        return overlay_rect
+
+    def draw_profiler_overlay(self):
+        if not self.profiler_lines: return None
+        panel = pygame.Rect(C.SCREEN_WIDTH - 340, 50, 320, 14 + 18 * len(self.profiler_lines))
+        pygame.draw.rect(self.screen, (0, 20, 0), panel)
+        pygame.draw.rect(self.screen, C.ACCENT_COLOR, panel, 1)
+        for i, line in enumerate(self.profiler_lines):
+            line_surf = self.text_cache.render(self.mono_font, line, C.TEXT_COLOR)
+            self.screen.blit(line_surf, (panel.x + 8, panel.y + 7 + i * 18))
+        return panel
+
+    def draw_overlays(self):
+        """Advice and profiler panels drawn over play. Returns the rects they painted."""
+        rects = []
+        if self.showing_advice:
+            rects.append(self.draw_text_overlay(self.latest_advice))
+        if self.showing_profiler:
+            rects.append(self.draw_profiler_overlay())
+        return [rect for rect in rects if rect]
+
+    def render_text(self, text, color):
+        """Font.render through the LRU surface cache."""
+        return self.text_cache.render(self.font, text, color)
+
+    def draw_hud(self):
+        """Integrity bar and counters. Returns the rects it painted."""
+        # The bar's dark frame lives in the static layer; only the fill is drawn here
+        rects = [render.INTEGRITY_BAR_RECT]
+        health_fill = (max(0, self.sim.integrity) / C.MAX_INTEGRITY) * 200
+        pygame.draw.rect(self.screen, C.ACCENT_COLOR, (20, 20, health_fill, 20))
+        
+        rects.append(self.screen.blit(self.render_text(f"INTEGRITY: {int(self.sim.integrity)}%", C.TEXT_COLOR), (20, 45)))
+        rects.append(self.screen.blit(self.render_text(f"CPU_CYCLES: {self.sim.cycles} Ghz", C.ACCENT_COLOR), (C.SCREEN_WIDTH - 255, 0)))
+        rects.append(self.screen.blit(self.render_text(f"VIRUS_PURGED: {self.sim.score}", C.TEXT_COLOR), (C.SCREEN_WIDTH - 250, 20)))
+        if self.wave_intel is not None:
+            intel = self.wave_intel
+            label = f"WAVE {intel.wave}: {intel.name} [THREAT: {intel.threat_level}]"
+            rects.append(self.screen.blit(self.render_text(label, C.ACCENT_COLOR), (20, 65)))
+        return rects
 
     def draw(self):
-        self.screen.fill(C.BG_COLOR)
-        
-        if self.state in ["START_MENU", "AI_LOADING"]:
-            msg = "INITIALIZING GEMINI LORE..." if self.state == "AI_LOADING" else self.lore_text
-            lines = msg.split('.')
-            for i, line in enumerate(lines):
-                if line.strip():
-                    text_surf = self.font.render(line.strip() + ".", True, C.TEXT_COLOR)
-                    self.screen.blit(text_surf, (50, 100 + (i * 30)))
+        """Paints the frame. Returns dirty rects for display.update, or None to flip."""
+        if self.renderer is not None:
+            if self.state == "PLAYING" and not self.sim.flashing():
+                return self.renderer.draw()
+            # Overlays and menus repaint everything; start clean when play resumes
+            self.renderer.invalidate()
+
+        if self.state == "START_MENU":
+            self.screen.fill(C.BG_COLOR)
+            for i, line in text_cache.sentence_lines(self.lore_text):
+                text_surf = self.render_text(line, C.TEXT_COLOR)
+                self.screen.blit(text_surf, (50, 100 + (i * 30)))
         
         elif self.state in ["PLAYING", "GAME_OVER"]:
-            self.towers.draw(self.screen)
-            self.enemies.draw(self.screen)
-            self.projectiles.draw(self.screen)
-            pygame.draw.rect(self.screen, C.CORE_COLOR, (C.SCREEN_WIDTH//2-20, C.SCREEN_HEIGHT//2-20, 40, 40))
+            # Grid, path, core and bar frame in one blit
+            self.screen.blit(self.static_layer.get(self.screen.get_size()), (0, 0))
+            self.sim.towers.draw(self.screen)
+            self.sim.enemies.draw(self.screen)
+            self.sim.projectiles.draw(self.screen)
 
-            for enemy in self.enemies:
+            for enemy in self.sim.enemies:
                 enemy.draw_health_bar(self.screen)
 
             # UI
-            pygame.draw.rect(self.screen, (50, 0, 0), (20, 20, 200, 20))
-            health_fill = (max(0, self.integrity) / C.MAX_INTEGRITY) * 200
-            pygame.draw.rect(self.screen, C.ACCENT_COLOR, (20, 20, health_fill, 20))
-            
-            self.screen.blit(self.font.render(f"INTEGRITY: {int(self.integrity)}%", True, C.TEXT_COLOR), (20, 45))
-            self.screen.blit(self.font.render(f"CPU_CYCLES: {self.cycles} Ghz", True, C.ACCENT_COLOR), (C.SCREEN_WIDTH - 255, 0))
-            self.screen.blit(self.font.render(f"VIRUS_PURGED: {self.score}", True, C.TEXT_COLOR), (C.SCREEN_WIDTH - 250, 20))
+            self.draw_hud()
 
-            if self.showing_advice:
-                self.draw_text_overlay(self.latest_advice)
+            self.draw_overlays()
 
             if self.state == "GAME_OVER":
                 overlay = pygame.Surface((C.SCREEN_WIDTH, C.SCREEN_HEIGHT), pygame.SRCALPHA)
                 overlay.fill((20, 0, 0, 210))
                 self.screen.blit(overlay, (0, 0))
-                fail_text = self.font.render("CRITICAL_FAILURE: SYSTEM_REDACTED", True, (255, 50, 50))
+                fail_text = self.render_text("CRITICAL_FAILURE: SYSTEM_REDACTED", (255, 50, 50))
                 self.screen.blit(fail_text, (C.SCREEN_WIDTH//2 - 200, C.SCREEN_HEIGHT//2 - 60))
-                taunt_surf = self.font.render(f"> {self.virus_taunt}", True, (0, 255, 150))
+                taunt_surf = self.render_text(f"> {self.virus_taunt}", (0, 255, 150))
                 self.screen.blit(taunt_surf, (50, C.SCREEN_HEIGHT//2 + 10))
 
-        if self.state == "PLAYING" and pygame.time.get_ticks() - self.flash_timer < 100:
+        if self.state == "PLAYING" and self.sim.flashing():
             flash_surf = pygame.Surface((C.SCREEN_WIDTH, C.SCREEN_HEIGHT))
             flash_surf.set_alpha(128)
             flash_surf.fill((255, 0, 0))
             self.screen.blit(flash_surf, (0, 0))
 
     def reset_game(self):
-        self.integrity = C.MAX_INTEGRITY
-        self.cycles = C.STARTING_CYCLES
-        self.game_over = False
+        # Nothing from the previous run may land in the new one
+        self.ai.cancel_all()
+        self.advice_stream = None
+        self.advice_chunks = 0
+        self.showing_advice = False
+        self.sim.reset()
         self.ai_called_end = False
-        self.score = 0
-        self.enemies.empty()
-        self.towers.empty()
-        self.projectiles.empty()
         self.state = "START_MENU"
         self.lore_text = "Firewall Re-initialized. Press SPACE to start..."
 
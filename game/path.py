@@ -0,0 +1,46 @@
+import math
+from bisect import bisect_right
+import constants as C
+
+
+class EnemyPath:
+    """Arc-length table over a waypoint polyline.
+
+    Built once; enemies then only carry a scalar distance travelled and ask
+    position_at() where that puts them. Large speeds can't overshoot a corner
+    because the distance is clamped to the polyline, not to a waypoint.
+    """
+
+    def __init__(self, points):
+        self.points = [(float(x), float(y)) for x, y in points]
+        self.cumulative = [0.0]
+        self.directions = []
+        for (x0, y0), (x1, y1) in zip(self.points, self.points[1:]):
+            seg = math.hypot(x1 - x0, y1 - y0)
+            self.cumulative.append(self.cumulative[-1] + seg)
+            self.directions.append(((x1 - x0) / seg, (y1 - y0) / seg) if seg else (0.0, 0.0))
+        self.length = self.cumulative[-1]
+
+    def segment_at(self, distance):
+        """Index of the segment containing distance (clamped to the path)."""
+        i = bisect_right(self.cumulative, distance) - 1
+        return min(max(i, 0), len(self.directions) - 1)
+
+    def position_at(self, distance):
+        if distance <= 0:
+            return self.points[0]
+        if distance >= self.length:
+            return self.points[-1]
+        i = self.segment_at(distance)
+        x0, y0 = self.points[i]
+        dx, dy = self.directions[i]
+        t = distance - self.cumulative[i]
+        return (x0 + dx * t, y0 + dy * t)
+
+    def progress(self, distance):
+        """Fraction of the path covered, 0.0 at the spawn and 1.0 at the exit."""
+        return min(distance / self.length, 1.0) if self.length else 1.0
+
+
+# Built once at import; every enemy shares it
+ENEMY_PATH = EnemyPath(C.ENEMY_PATH)
@@ -0,0 +1,94 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.started) * 1000
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:
+    """Per-phase frame timings (ms) kept in a ring buffer of recent frames.
+
+    Wrap each part of the frame in `with profiler.phase("name"):` and call
+    end_frame() once per loop. summary() gives p50/p95/p99 per phase and the
+    buffer can be written to CSV or JSON when the session ends.
+    """
+
+    def __init__(self, capacity=600):
+        self.frames = deque(maxlen=capacity)
+        self.current = {}
+        self.phases = []  # First-seen order, used for overlay and export columns
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def end_frame(self):
+        frame = self.current
+        for name in frame:
+            if name not in self.phases:
+                self.phases.append(name)
+        frame["frame"] = sum(frame.values())
+        self.frames.append(frame)
+        self.current = {}
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        values = sorted(frame.get(name, 0.0) for frame in self.frames)
+        if not values:
+            return {f"p{p}": 0.0 for p in points}
+        last = len(values) - 1
+        return {f"p{p}": values[min(last, round(last * p / 100))] for p in points}
+
+    def summary(self):
+        return {name: self.percentiles(name) for name in self.phases + ["frame"]}
+
+    def overlay_lines(self):
+        lines = [f"{'PHASE':<14}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<14}{stats['p50']:>7.2f}{stats['p95']:>7.2f}{stats['p99']:>7.2f}")
+        return lines
+
+    def export(self, path):
+        """Writes every buffered frame to path as .json (with summary) or .csv."""
+        columns = self.phases + ["frame"]
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"summary": self.summary(),
+                           "frames": [{name: frame.get(name, 0.0) for name in columns} for frame in self.frames]},
+                          f, indent=2)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for frame in self.frames:
+                    writer.writerow([f"{frame.get(name, 0.0):.4f}" for name in columns])
+
+
+class NullProfiler:
+    """Stand-in when nobody is measuring; phases cost one shared nullcontext."""
+
+    _null = nullcontext()
+
+    def phase(self, name):
+        return self._null
+
+    def end_frame(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,157 @@
+import pygame
+import constants as C
+
+CORE_RECT = pygame.Rect(C.SCREEN_WIDTH//2-20, C.SCREEN_HEIGHT//2-20, 40, 40)
+INTEGRITY_BAR_RECT = pygame.Rect(20, 20, 200, 20)
+
+
+def build_static_layer(size):
+    """Paints everything that never moves: grid, enemy path, core and bar frame."""
+    surface = pygame.Surface(size)
+    surface.fill(C.BG_COLOR)
+    width, height = size
+
+    if C.SHOW_GRID:
+        for x in range(0, width, C.TILE_SIZE):
+            pygame.draw.line(surface, C.GRID_COLOR, (x, 0), (x, height))
+        for y in range(0, height, C.TILE_SIZE):
+            pygame.draw.line(surface, C.GRID_COLOR, (0, y), (width, y))
+
+    for (x0, y0), (x1, y1) in zip(C.ENEMY_PATH, C.ENEMY_PATH[1:]):
+        if x0 == x1 or y0 == y1:
+            # Axis-aligned lanes as rects so the corners join squarely
+            lane = pygame.Rect(min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0))
+            pygame.draw.rect(surface, C.PATH_COLOR, lane.inflate(C.PATH_WIDTH, C.PATH_WIDTH))
+        else:
+            pygame.draw.line(surface, C.PATH_COLOR, (x0, y0), (x1, y1), C.PATH_WIDTH)
+
+    pygame.draw.rect(surface, C.CORE_COLOR, CORE_RECT)
+    pygame.draw.rect(surface, (50, 0, 0), INTEGRITY_BAR_RECT)
+
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()  # Match the display format so blits are plain copies
+    return surface
+
+
+class StaticLayer:
+    """Caches build_static_layer() and rebuilds it only when the layout changes."""
+
+    def __init__(self):
+        self.surface = None
+        self.key = None
+        self.builds = 0
+
+    def get(self, size):
+        key = (tuple(size), tuple(C.ENEMY_PATH), C.PATH_WIDTH, C.TILE_SIZE, C.SHOW_GRID)
+        if key != self.key:
+            self.surface = build_static_layer(size)
+            self.key = key
+            self.builds += 1
+        return self.surface
+
+
+class DirtyRenderer:
+    """Opt-in dirty-rectangle painter for the PLAYING screen (C.DIRTY_RECTS).
+
+    Everything that doesn't move (the static layer plus towers) is baked into
+    one surface. Each frame only the areas that moving sprites, health bars, the
+    HUD and the advice/profiler overlays covered last frame or cover now are restored
+    and repainted, and draw() hands those rects to pygame.display.update().
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.background = None
+        self.layout_key = None
+        self.full = True
+
+        self.bar_rects = []
+        self.hud_key = None
+        self.hud_rects = []
+        self.overlay_rects = []
+
+    def invalidate(self):
+        """Forces the next frame to repaint (and flip) the whole screen."""
+        self.full = True
+
+    def build_background(self):
+        surface = self.app.static_layer.get(self.app.screen.get_size()).copy()
+        self.app.sim.towers.draw(surface)
+        return surface
+
+    def hud_state(self):
+        sim = self.app.sim
+        health_fill = round((max(0, sim.integrity) / C.MAX_INTEGRITY) * 200)
+        return (health_fill, int(sim.integrity), sim.cycles, sim.score, self.app.wave_intel)
+
+    def _sprite_rects(self, groups):
+        rects = []
+        for group in groups:
+            # spritedict holds the rect each sprite was last drawn at (0 if never drawn)
+            rects.extend(rect for rect in group.spritedict.values() if rect)
+        return rects
+
+    def _upcoming_rects(self):
+        """Where the moving layer is about to be drawn; enemy rects stretch up over their health bar."""
+        rects = [enemy.rect.union(enemy.rect.move(0, -10)) for enemy in self.app.sim.enemies]
+        rects.extend(projectile.rect for projectile in self.app.sim.projectiles)
+        return rects
+
+    def _draw_bars(self, screen):
+        return [rect for rect in (enemy.draw_health_bar(screen) for enemy in self.app.sim.enemies) if rect]
+
+    def draw(self):
+        """Paints one PLAYING frame. Returns the dirty rects, or None after a full repaint."""
+        app = self.app
+        screen = app.screen
+        sim = app.sim
+        moving = (sim.enemies, sim.projectiles)
+
+        layout_key = len(sim.towers)
+        if self.full or layout_key != self.layout_key:
+            self.background = self.build_background()
+            self.layout_key = layout_key
+            screen.blit(self.background, (0, 0))
+            for group in moving:
+                group.draw(screen)
+            self.bar_rects = self._draw_bars(screen)
+            self.hud_rects = app.draw_hud()
+            self.hud_key = self.hud_state()
+            self.overlay_rects = app.draw_overlays()
+            self.full = False
+            return None
+
+        # 1. Restore the background wherever something was drawn last frame
+        erased = self._sprite_rects(moving)
+        for group in moving:
+            erased.extend(group.lostsprites)  # Killed since their last draw
+        erased.extend(self.bar_rects)
+        erased.extend(self.overlay_rects)
+
+        # The HUD is painted over sprites, so decide now whether it is redrawn:
+        # its background has to go back before the sprites do, not after
+        hud_key = self.hud_state()
+        touched = erased + self._upcoming_rects()
+        redraw_hud = hud_key != self.hud_key or any(rect.collidelist(touched) != -1 for rect in self.hud_rects)
+        if redraw_hud:
+            erased.extend(self.hud_rects)
+        for rect in erased:
+            screen.blit(self.background, rect, rect)
+
+        # 2. Draw the moving layer in its new position
+        for group in moving:
+            group.draw(screen)
+        drawn = self._sprite_rects(moving)
+        self.bar_rects = self._draw_bars(screen)
+        drawn.extend(self.bar_rects)
+        dirty = erased + drawn
+
+        # 3. HUD on top, only when its numbers changed or a sprite touched it
+        if redraw_hud:
+            self.hud_rects = app.draw_hud()
+            self.hud_key = hud_key
+            dirty.extend(self.hud_rects)
+
+        self.overlay_rects = app.draw_overlays()
+        dirty.extend(self.overlay_rects)
+        return dirty
@@ -0,0 +1,153 @@
+"""AI integration benchmark against the local stand-in backend (no network).
+
+Plays GameApp at 60 FPS in real time on SDL's dummy driver while ending a
+wave every few seconds and asking the advisor for tips, once per simulated
+backend profile. Reports frame times, how long the advice overlay took to
+show real text, and how often lore and advice fell back to local lines.
+
+    python game/scripts/bench_ai.py
+    python game/scripts/bench_ai.py --profile quota --profile outage --seconds 60 --out ai.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import constants as C
+import main
+from ai_gateway import AIGateway
+from ai_backends import SimulatedBackend, SIM_PROFILES
+from lore import LorePrefetcher
+from simulation import tower_grid
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, round((len(values) - 1) * p / 100))]
+
+
+def build_game(profile, seed):
+    random.seed(seed)
+    game = main.GameApp()
+    game.ai = AIGateway(SimulatedBackend.from_profile(profile, seed=seed))
+    game.lore = LorePrefetcher(game.ai)
+    sim = game.sim
+    sim.cycles = 20 * C.TOWER_COST
+    for pos in tower_grid()[:20]:
+        sim.place_tower(pos)
+    game.state = "PLAYING"
+    return game
+
+
+async def play(game, seconds, wave_every, advice_every):
+    """Runs the real loop body at 60 FPS; returns the raw measurements."""
+    clock = pygame.time.Clock()
+    work_ms, interval_ms = [], []
+    advice_first_ms, advice_total_ms = [], []
+    advice_requests = advice_fallbacks = waves = lore_fallbacks = breaker_trips = 0
+    asked_at = shown_at = None
+    breaker_state = game.ai.breaker.state
+    game.lore.fill(game.sim.wave)
+
+    started = time.perf_counter()
+    next_wave = started + wave_every
+    next_advice = started + 1.0
+    while time.perf_counter() - started < seconds:
+        interval_ms.append(clock.tick(C.FPS))
+        now = time.perf_counter()
+        game.sim.integrity = C.MAX_INTEGRITY  # Keep the run going for its full length
+
+        if now >= next_wave:
+            next_wave += wave_every
+            game.sim.end_wave()
+            waves += 1
+            lore_fallbacks += game.wave_intel.name == "UNKNOWN_STRAIN"
+        if now >= next_advice and asked_at is None:
+            next_advice = now + advice_every
+            game.showing_advice = False
+            game.fetch_ai_advice()
+            advice_requests += 1
+            asked_at, shown_at = now, None
+
+        frame_started = time.perf_counter()
+        game.update(1000 // C.FPS)
+        dirty_rects = game.draw()
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+        work_ms.append((time.perf_counter() - frame_started) * 1000)
+
+        if asked_at is not None:
+            if shown_at is None and game.latest_advice != "ACCESSING TACTICAL ADVISOR...":
+                shown_at = time.perf_counter()
+                advice_first_ms.append((shown_at - asked_at) * 1000)
+            if game.advice_stream is None:
+                advice_total_ms.append((time.perf_counter() - asked_at) * 1000)
+                if game.latest_advice in C.LOCAL_ADVICE_BACKUP or game.latest_advice.startswith("AI_OFFLINE"):
+                    advice_fallbacks += 1
+                asked_at = None
+
+        if game.ai.breaker.state != breaker_state:
+            breaker_state = game.ai.breaker.state
+            breaker_trips += breaker_state == "open"
+        await asyncio.sleep(0)
+
+    game.ai.close()
+    return {
+        "frames": len(work_ms),
+        "work_p50_ms": percentile(work_ms, 50),
+        "work_p99_ms": percentile(work_ms, 99),
+        "interval_p99_ms": percentile(interval_ms[1:], 99),
+        "interval_max_ms": max(interval_ms[1:], default=0),
+        "advice_requests": advice_requests,
+        "advice_first_p50_ms": percentile(advice_first_ms, 50),
+        "advice_first_p95_ms": percentile(advice_first_ms, 95),
+        "advice_total_p50_ms": percentile(advice_total_ms, 50),
+        "advice_fallback_pct": 100 * advice_fallbacks / max(1, advice_requests),
+        "waves": waves,
+        "lore_fallback_pct": 100 * lore_fallbacks / max(1, waves),
+        "backend_calls": game.ai.backend.calls,
+        "breaker_trips": breaker_trips,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", action="append", choices=sorted(SIM_PROFILES),
+                        help="backend profile to run (repeatable, default: all)")
+    parser.add_argument("--seconds", type=float, default=20, help="wall-clock seconds per profile")
+    parser.add_argument("--wave-every", type=float, default=2.0, help="seconds between forced wave ends")
+    parser.add_argument("--advice-every", type=float, default=3.0, help="seconds between advisor requests")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'profile':<11}{'work p99':>9}{'tick p99':>9}{'tick max':>9}{'advice 1st':>11}"
+          f"{'advice fb%':>11}{'lore fb%':>9}{'calls':>7}{'trips':>6}")
+    for profile in args.profile or SIM_PROFILES:
+        game = build_game(profile, args.seed)
+        result = results[profile] = asyncio.run(play(game, args.seconds, args.wave_every, args.advice_every))
+        print(f"{profile:<11}{result['work_p99_ms']:>9.2f}{result['interval_p99_ms']:>9.1f}"
+              f"{result['interval_max_ms']:>9.1f}{result['advice_first_p50_ms']:>11.0f}"
+              f"{result['advice_fallback_pct']:>11.0f}{result['lore_fallback_pct']:>9.0f}"
+              f"{result['backend_calls']:>7}{result['breaker_trips']:>6}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"seed": args.seed, "seconds": args.seconds, "profiles": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,65 @@
+"""Compares tower target acquisition: linear scan vs SpatialGrid.
+
+Run from the repo root or game/:  python game/scripts/bench_spatial.py
+"""
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import constants as C
+from enemy import Enemy
+from tower import Tower
+from spatial import SpatialGrid
+from simulation import tower_grid
+
+TOWER_COUNT = 120
+ENEMY_COUNTS = [25, 50, 100, 200, 400, 800, 1600]
+ROUNDS = 5
+
+
+def build_field(enemy_count, rng):
+    group = pygame.sprite.Group()
+    grid = SpatialGrid()
+    for _ in range(enemy_count):
+        enemy = Enemy(wave_num=30)
+        enemy.rect.center = (rng.randrange(C.SCREEN_WIDTH), rng.randrange(C.SCREEN_HEIGHT))
+        group.add(enemy)
+        grid.insert(enemy)
+    return group, grid
+
+
+def time_queries(towers, query):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for tower in towers:
+            query(tower)
+        best = min(best, time.perf_counter() - started)
+    return best / len(towers) * 1e6
+
+
+def main():
+    rng = random.Random(1337)
+    towers = [Tower(x, y, now=0) for x, y in tower_grid()[:TOWER_COUNT]]
+
+    print(f"{len(towers)} towers, range {C.TOWER_RANGE}px, cell {C.TILE_SIZE}px (best of {ROUNDS})")
+    print(f"{'enemies':>8} {'linear us/query':>16} {'grid us/query':>14} {'speedup':>8}")
+    for count in ENEMY_COUNTS:
+        group, grid = build_field(count, rng)
+        for tower in towers:
+            # Same answer either way; ties on exact distance are the only difference
+            linear = tower.find_target(group)
+            gridded = tower.find_target(group, grid)
+            assert (linear is None) == (gridded is None)
+        linear_us = time_queries(towers, lambda t: t.find_target(group))
+        grid_us = time_queries(towers, lambda t: t.find_target(group, grid))
+        print(f"{count:>8} {linear_us:>16.1f} {grid_us:>14.1f} {linear_us / grid_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Scripted game-loop benchmark.
+
+Runs fixed scenarios through GameApp.update/draw on SDL's dummy video driver
+and reports ticks per second, frame-time percentiles and peak memory.
+
+    python game/scripts/benchmark.py --out bench.json
+    python game/scripts/benchmark.py --baseline bench.json --max-regression 10
+
+With --baseline the run exits non-zero if any scenario regressed by more
+than the allowed percentage, so results can be compared across commits.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+import tracemalloc
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+import pygame
+import constants as C
+import main
+from ai_gateway import AIGateway
+from lore import LorePrefetcher
+from simulation import FRAME_MS, tower_grid
+
+# name -> (wave, towers, tower cooldown override in ms or None)
+SCENARIOS = {
+    "wave_1": (1, 0, None),
+    "wave_25_40_towers": (25, 40, None),
+    "wave_60_200_towers": (60, 200, None),
+    "projectile_storm": (40, 120, 100),
+}
+
+# Metric -> True when bigger is better
+METRICS = {"ticks_per_sec": True, "p50_ms": False, "p95_ms": False, "p99_ms": False, "peak_kib": False}
+
+
+def build_game(wave, towers, seed):
+    random.seed(seed)
+    game = main.GameApp()
+    # AI off: no Gemini calls or cache writes, and no network time in the frames
+    game.ai.close()
+    if game.ai.cache is not None:
+        game.ai.cache.close()
+    game.ai = AIGateway(None)
+    game.lore = LorePrefetcher(game.ai)
+    sim = game.sim
+    sim.wave = wave
+    sim.max_enemies_this_wave = 5 + 2 * (wave - 1)
+    sim.cycles = towers * C.TOWER_COST
+    # Dense grid first, then fill the gaps, so 200 towers still fit on screen
+    spots = tower_grid() + tower_grid(margin=C.TILE_SIZE * 2)
+    for pos in spots[:towers]:
+        sim.place_tower(pos)
+    game.state = "PLAYING"
+    return game
+
+
+async def drive(game, ticks):
+    """Runs ticks frames the way GameApp.run does, minus the 60 FPS limiter."""
+    frame_ms = []
+    for _ in range(ticks):
+        # The core is invulnerable here so every scenario runs its full length
+        game.sim.integrity = C.MAX_INTEGRITY
+        started = time.perf_counter()
+        game.update(FRAME_MS)
+        dirty_rects = game.draw()
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+        frame_ms.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0)  # Lets wave-lore tasks complete like in the real loop
+    return frame_ms
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, round((len(sorted_values) - 1) * p / 100))]
+
+
+def run_scenario(name, ticks, seed):
+    wave, towers, cooldown = SCENARIOS[name]
+    saved_cooldown = C.TOWER_COOLDOWN
+    if cooldown is not None:
+        C.TOWER_COOLDOWN = cooldown
+    try:
+        game = build_game(wave, towers, seed)
+        started = time.perf_counter()
+        frame_ms = asyncio.run(drive(game, ticks))
+        elapsed = time.perf_counter() - started
+
+        # Second, traced pass: tracemalloc distorts timing too much to share a run
+        game = build_game(wave, towers, seed)
+        tracemalloc.start()
+        asyncio.run(drive(game, ticks))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        C.TOWER_COOLDOWN = saved_cooldown
+
+    frame_ms.sort()
+    return {
+        "ticks": ticks,
+        "ticks_per_sec": ticks / elapsed,
+        "p50_ms": percentile(frame_ms, 50),
+        "p95_ms": percentile(frame_ms, 95),
+        "p99_ms": percentile(frame_ms, 99),
+        "peak_kib": peak / 1024,
+        "final_wave": game.sim.wave,
+        "score": game.sim.score,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=GAME_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_regression):
+    """Returns a list of human-readable regressions beyond max_regression percent."""
+    failures = []
+    for name, current in results.items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = before[metric], current[metric]
+            if not old:
+                continue
+            change = (new - old) / old * 100
+            regression = -change if higher_is_better else change
+            if regression > max_regression:
+                failures.append(f"{name}.{metric}: {old:.2f} -> {new:.2f} ({change:+.1f}%)")
+    return failures
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only this scenario (repeatable)")
+    parser.add_argument("--ticks", type=int, default=1800, help="frames per scenario (default: 30 s of game time)")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON from an earlier commit to compare against")
+    parser.add_argument("--max-regression", type=float, default=10.0,
+                        help="allowed slowdown/growth per metric, in percent")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'scenario':<22}{'ticks/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak KiB':>11}")
+    for name in args.scenario or SCENARIOS:
+        result = results[name] = run_scenario(name, args.ticks, args.seed)
+        print(f"{name:<22}{result['ticks_per_sec']:>10.0f}{result['p50_ms']:>9.2f}"
+              f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}{result['peak_kib']:>11.0f}")
+
+    report = {"revision": git_revision(), "python": platform.python_version(),
+              "pygame": pygame.version.ver, "seed": args.seed, "scenarios": results}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.max_regression)
+        if failures:
+            print(f"\nREGRESSIONS vs {baseline.get('revision')} (> {args.max_regression}%):")
+            for line in failures:
+                print("  " + line)
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.max_regression}% vs {baseline.get('revision')}.")
+
+
+if __name__ == "__main__":
+    main_cli()
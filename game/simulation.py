@@ -0,0 +1,207 @@
+import os
+import time
+import pygame
+import constants as C
+from enemy import Enemy
+from tower import Tower, ProjectilePool
+from spatial import SpatialGrid
+from swarm import EnemySwarm, np
+from profiler import NULL_PROFILER
+
+# Fixed simulation step used by headless runs (same cadence as the real game)
+FRAME_MS = 1000 // C.FPS
+
+
+class SimClock:
+    """Millisecond clock that only moves when the simulation steps it."""
+
+    def __init__(self, start=0):
+        self.now = start
+
+    def advance(self, dt):
+        self.now += dt
+        return self.now
+
+
+class Simulation:
+    """Game rules for the PLAYING phase, with no window, font or frame limiter.
+
+    GameApp drives it once per frame with the real frame time; headless runs
+    call step() in a tight loop with FRAME_MS so waves resolve as fast as the
+    CPU allows.
+    """
+
+    def __init__(self, clock=None, on_wave_end=None, on_game_over=None,
+                 enemy_backend=C.ENEMY_BACKEND, profiler=NULL_PROFILER):
+        self.clock = clock or SimClock()
+        self.profiler = profiler
+        self.on_wave_end = on_wave_end
+        self.on_game_over = on_game_over
+
+        self.core_rect = pygame.Rect(1280//2-20, 720//2-20, 40, 40)
+
+        # Stats
+        self.cycles = 100
+        self.integrity = C.MAX_INTEGRITY
+        self.game_over = False
+
+        # Sprite Groups
+        self.enemies = pygame.sprite.Group()
+        self.towers = pygame.sprite.Group()
+        self.projectiles = pygame.sprite.Group()
+        self.projectile_pool = ProjectilePool()
+        self.grid = SpatialGrid()
+        # Vectorised enemy movement when asked for and NumPy is importable
+        self.swarm = EnemySwarm(grid=self.grid) if enemy_backend == "numpy" and np is not None else None
+
+        # Wave-tracking
+        self.wave = 1
+        self.enemies_spawned_this_wave = 0
+        self.max_enemies_this_wave = 5
+
+        self.spawn_timer = 0
+        self.score = 0
+        self.flash_timer = None
+
+    def can_afford_tower(self):
+        return self.cycles >= C.TOWER_COST
+
+    def place_tower(self, pos):
+        """Buys a tower at pos. Returns False if unaffordable or the tile is taken."""
+        if not self.can_afford_tower():
+            return False
+        new_tower = Tower(pos[0], pos[1], now=self.clock.now, pool=self.projectile_pool)
+        if pygame.sprite.spritecollideany(new_tower, self.towers):
+            return False
+        self.towers.add(new_tower)
+        self.cycles -= C.TOWER_COST
+        return True
+
+    def step(self, dt):
+        if self.game_over:
+            return
+        now = self.clock.advance(dt)
+
+        self.spawn_timer += dt
+        if self.spawn_timer > 1500 and self.enemies_spawned_this_wave < self.max_enemies_this_wave:
+            if self.swarm is not None:
+                self.enemies.add(self.swarm.spawn(self.wave))
+            else:
+                self.enemies.add(Enemy(wave_num=self.wave, grid=self.grid))
+            self.enemies_spawned_this_wave += 1
+            self.spawn_timer = 0
+
+        if self.enemies_spawned_this_wave >= self.max_enemies_this_wave and len(self.enemies) == 0:
+            self.end_wave()
+
+        prof = self.profiler
+        with prof.phase("enemies"):
+            if self.swarm is not None:
+                self.swarm.step()
+            self.enemies.update()
+        with prof.phase("towers"):
+            self.towers.update(self.enemies, self.projectiles, now, self.grid)
+        with prof.phase("projectiles"):
+            self.projectiles.update()
+
+        # Collisions
+        with prof.phase("groupcollide"):
+            hits = pygame.sprite.groupcollide(self.enemies, self.projectiles, False, True)
+            if hits:
+                for enemy_hit in hits:
+                    enemy_hit.health -= 1
+                    if enemy_hit.health <= 0:
+                        enemy_hit.kill()
+                        self.cycles += C.REWARD_PER_VIRUS
+                        self.score += 1
+
+        with prof.phase("core_contact"):
+            for enemy in self.enemies:
+                if enemy.rect.colliderect(self.core_rect):
+                    self.integrity -= 0.1
+                    if now % 500 < 20:
+                        self.flash_timer = now
+                if enemy.reached_end:
+                    self.integrity -= 10
+                    enemy.kill()
+
+        if self.integrity <= 0:
+            self.integrity = 0
+            self.game_over = True
+            if self.on_game_over:
+                self.on_game_over()
+
+    def end_wave(self):
+        self.wave += 1
+        self.enemies_spawned_this_wave = 0
+        self.max_enemies_this_wave += 2
+        self.cycles += 50
+        if self.on_wave_end:
+            self.on_wave_end(self.wave)
+
+    def flashing(self, duration=100):
+        return self.flash_timer is not None and self.clock.now - self.flash_timer < duration
+
+    def reset(self):
+        self.integrity = C.MAX_INTEGRITY
+        self.cycles = C.STARTING_CYCLES
+        self.game_over = False
+        self.score = 0
+        self.flash_timer = None
+        self.enemies.empty()
+        if self.swarm is not None:
+            self.swarm.clear()
+        self.grid.clear()
+        self.towers.empty()
+        for projectile in self.projectiles:
+            projectile.kill()  # Back to the pool rather than dropped
+
+    # --- HEADLESS DRIVERS ---
+
+    def run_wave(self, max_ticks=100000):
+        """Steps until the current wave ends or the core falls. Returns ticks used."""
+        start_wave = self.wave
+        ticks = 0
+        while self.wave == start_wave and not self.game_over and ticks < max_ticks:
+            self.step(FRAME_MS)
+            ticks += 1
+        return ticks
+
+    def run_waves(self, count, max_ticks=100000):
+        ticks = 0
+        for _ in range(count):
+            if self.game_over:
+                break
+            ticks += self.run_wave(max_ticks)
+        return ticks
+
+
+def tower_grid(spacing=C.TILE_SIZE * 2, margin=C.TILE_SIZE):
+    """Tile-aligned tower positions covering the playfield, for headless runs."""
+    return [(x, y)
+            for y in range(margin, C.SCREEN_HEIGHT - margin, spacing)
+            for x in range(margin, C.SCREEN_WIDTH - margin, spacing)]
+
+
+# --- HEADLESS ENTRY POINT ---
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run SENTINEL.EXE waves without a window.")
+    parser.add_argument("--waves", type=int, default=20)
+    parser.add_argument("--towers", type=int, default=0, help="towers placed on a grid before wave 1")
+    parser.add_argument("--backend", choices=["sprite", "numpy"], default=C.ENEMY_BACKEND)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    sim = Simulation(enemy_backend=args.backend)
+    sim.cycles = max(sim.cycles, args.towers * C.TOWER_COST)
+    for pos in tower_grid()[:args.towers]:
+        sim.place_tower(pos)
+
+    started = time.perf_counter()
+    ticks = sim.run_waves(args.waves)
+    elapsed = time.perf_counter() - started
+    print(f"wave={sim.wave} score={sim.score} integrity={sim.integrity:.1f} "
+          f"ticks={ticks} wall={elapsed:.2f}s speedup={ticks * FRAME_MS / 1000 / max(elapsed, 1e-9):.0f}x")
+    print(f"projectile pool: {sim.projectile_pool.stats()}")
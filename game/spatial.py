@@ -0,0 +1,90 @@
+import constants as C
+
+
+class SpatialGrid:
+    """Uniform hash grid of C.TILE_SIZE cells holding the sprites inside them.
+
+    Enemies call move() after they change position, so a tower only has to
+    look at the cells its range circle touches instead of every live enemy.
+    """
+
+    def __init__(self, cell_size=C.TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}   # (col, row) -> set of sprites
+        self.where = {}   # sprite -> (col, row)
+
+    def cell_of(self, pos):
+        return (int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size)
+
+    def insert(self, sprite):
+        cell = self.cell_of(sprite.rect.center)
+        self.cells.setdefault(cell, set()).add(sprite)
+        self.where[sprite] = cell
+
+    def move(self, sprite):
+        cell = self.cell_of(sprite.rect.center)
+        old = self.where.get(sprite)
+        if old == cell:
+            return
+        if old is not None:
+            self._discard(old, sprite)
+        self.cells.setdefault(cell, set()).add(sprite)
+        self.where[sprite] = cell
+
+    def remove(self, sprite):
+        old = self.where.pop(sprite, None)
+        if old is not None:
+            self._discard(old, sprite)
+
+    def _discard(self, cell, sprite):
+        bucket = self.cells[cell]
+        bucket.discard(sprite)
+        if not bucket:
+            del self.cells[cell]
+
+    def clear(self):
+        self.cells.clear()
+        self.where.clear()
+
+    def cells_within(self, center, radius):
+        """Cells whose area intersects the circle. Towers never move, so they cache this."""
+        size = self.cell_size
+        cx, cy = center
+        r2 = radius * radius
+        min_col, max_col = int(cx - radius) // size, int(cx + radius) // size
+        min_row, max_row = int(cy - radius) // size, int(cy + radius) // size
+        cells = set()
+        for col in range(min_col, max_col + 1):
+            # Closest x inside this column to the circle centre
+            dx = max(col * size - cx, 0, cx - (col + 1) * size)
+            for row in range(min_row, max_row + 1):
+                dy = max(row * size - cy, 0, cy - (row + 1) * size)
+                if dx * dx + dy * dy <= r2:
+                    cells.add((col, row))
+        return frozenset(cells)
+
+    def nearest(self, center, radius, cells=None):
+        """Closest sprite strictly inside radius of center, or None."""
+        if not self.where:
+            return None
+        if cells is None:
+            cells = self.cells_within(center, radius)
+        cx, cy = center
+        best = None
+        best_d2 = radius * radius
+        grid = self.cells
+        if len(self.where) < len(cells):
+            # Sparse waves: fewer sprites than cells to probe, just check them all
+            candidates = self.where
+        else:
+            candidates = [sprite for cell in cells if cell in grid for sprite in grid[cell]]
+        for sprite in candidates:
+            ex, ey = sprite.rect.center
+            d2 = (ex - cx) ** 2 + (ey - cy) ** 2
+            if d2 < best_d2:
+                best_d2 = d2
+                best = sprite
+        return best
+
+    def __len__(self):
+        return len(self.where)
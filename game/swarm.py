@@ -0,0 +1,162 @@
+import pygame
+from enemy import Enemy, archetype_for
+from path import ENEMY_PATH
+
+try:
+    import numpy as np
+except ImportError:  # pygbag/web builds ship without NumPy
+    np = None
+
+
+class SwarmEnemy(pygame.sprite.Sprite):
+    """Sprite-like handle onto one row of an EnemySwarm.
+
+    It carries the image/rect that Group.draw and groupcollide need; position
+    and health live in the swarm's arrays and are moved by EnemySwarm.step().
+    """
+
+    max_health = 3
+    draw_health_bar = Enemy.draw_health_bar
+
+    def __init__(self, swarm, index, image, center):
+        super().__init__()
+        self.swarm = swarm
+        self.index = index
+        self.image = image
+        self.rect = image.get_rect(center=center)
+        self.reached_end = False
+
+    @property
+    def health(self):
+        return int(self.swarm.health[self.index])
+
+    @health.setter
+    def health(self, value):
+        self.swarm.health[self.index] = value
+
+    @property
+    def distance(self):
+        return float(self.swarm.distance[self.index])
+
+    @property
+    def progress(self):
+        return self.swarm.path.progress(self.distance)
+
+    def update(self, *args):
+        pass  # Movement happens in one vectorised EnemySwarm.step()
+
+    def kill(self):
+        if self.swarm is not None:
+            self.swarm.remove(self)
+        super().kill()
+
+
+class EnemySwarm:
+    """Structure-of-arrays store for every live enemy.
+
+    Positions, distances along the path, speeds and health sit in contiguous
+    NumPy arrays so a tick is a handful of vector ops instead of one Python
+    update() per virus. Rows are kept dense with swap-remove.
+    """
+
+    def __init__(self, path=ENEMY_PATH, capacity=256, grid=None):
+        if np is None:
+            raise ImportError("EnemySwarm needs NumPy; use the sprite backend instead")
+        self.path = path
+        self.points = np.array(path.points, dtype=np.float64)
+        self.cumulative = np.array(path.cumulative, dtype=np.float64)
+        self.directions = np.array(path.directions, dtype=np.float64)
+        self.grid = grid
+        self.count = 0
+        self.handles = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = self.count
+        pos = np.zeros((capacity, 2), dtype=np.float64)
+        speed = np.zeros(capacity, dtype=np.float64)
+        health = np.zeros(capacity, dtype=np.int32)
+        distance = np.zeros(capacity, dtype=np.float64)
+        if old:
+            pos[:old] = self.pos[:old]
+            speed[:old] = self.speed[:old]
+            health[:old] = self.health[:old]
+            distance[:old] = self.distance[:old]
+        self.pos, self.speed, self.health, self.distance = pos, speed, health, distance
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, wave_num=1):
+        """Adds one enemy from the wave's shared archetype and returns its handle."""
+        if self.count == len(self.speed):
+            self._allocate(len(self.speed) * 2)
+        i = self.count
+        start = self.points[0]
+        archetype = archetype_for(wave_num)
+
+        handle = SwarmEnemy(self, i, archetype.image, (int(start[0]), int(start[1])))
+        self.pos[i] = handle.rect.center
+        self.speed[i] = archetype.speed
+        self.health[i] = SwarmEnemy.max_health
+        self.distance[i] = 0.0
+        self.handles.append(handle)
+        self.count += 1
+        if self.grid is not None:
+            self.grid.insert(handle)
+        return handle
+
+    def remove(self, handle):
+        i = handle.index
+        if i is None:
+            return
+        last = self.count - 1
+        if i != last:
+            self.pos[i] = self.pos[last]
+            self.speed[i] = self.speed[last]
+            self.health[i] = self.health[last]
+            self.distance[i] = self.distance[last]
+            moved = self.handles[last]
+            moved.index = i
+            self.handles[i] = moved
+        self.handles.pop()
+        self.count = last
+        handle.index = None
+        handle.swarm = None
+        if self.grid is not None:
+            self.grid.remove(handle)
+
+    def step(self):
+        n = self.count
+        if not n:
+            return
+        pos = self.pos[:n]
+        distance = self.distance[:n]
+        length = self.path.length
+
+        # Same rule as Enemy.update: advance along the arc-length table, clamp at the exit
+        distance += self.speed[:n]
+        np.minimum(distance, length, out=distance)
+        seg = np.searchsorted(self.cumulative, distance, side="right") - 1
+        np.clip(seg, 0, len(self.directions) - 1, out=seg)
+        along = (distance - self.cumulative[seg])[:, None]
+        pos[:] = self.points[seg] + self.directions[seg] * along
+
+        handles = self.handles
+        grid = self.grid
+        centers = np.rint(pos).astype(np.int64).tolist()
+        for handle, center in zip(handles, centers):
+            handle.rect.center = center
+            if grid is not None:
+                grid.move(handle)
+        for i in np.flatnonzero(distance >= length).tolist():
+            handles[i].reached_end = True
+
+    def clear(self):
+        for handle in self.handles:
+            handle.index = None
+            handle.swarm = None
+            if self.grid is not None:
+                self.grid.remove(handle)
+        self.handles = []
+        self.count = 0
@@ -0,0 +1,46 @@
+import textwrap
+from collections import OrderedDict
+from functools import lru_cache
+
+
+class TextCache:
+    """LRU of rendered text surfaces keyed by (text, color, font).
+
+    HUD counters and AI overlays repeat the same strings frame after frame;
+    Font.render only runs when a string is new or has been evicted.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (text, color, font, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+
+@lru_cache(maxsize=64)
+def wrap_lines(text, width):
+    """textwrap.wrap, computed once per distinct advice/taunt string."""
+    return tuple(textwrap.wrap(text, width=width))
+
+
+@lru_cache(maxsize=64)
+def sentence_lines(text):
+    """Splits lore on '.' into (row, sentence) pairs, keeping the row gaps of empty pieces."""
+    return tuple((i, line.strip() + ".") for i, line in enumerate(text.split('.')) if line.strip())
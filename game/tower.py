@@ -3,7 +3,7 @@ import constants as C
 import math
 
 class Tower(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, now=None, pool=None):
         super().__init__()
         # Align to grid
         grid_x = (x // C.TILE_SIZE) * C.TILE_SIZE + C.TILE_SIZE // 2
@@ -14,43 +14,71 @@ class Tower(pygame.sprite.Sprite):
         self.rect = self.image.get_rect(center=(grid_x, grid_y))
         
         self.range = C.TOWER_RANGE
-        self.last_shot = pygame.time.get_ticks()
+        self.grid_cells = None  # Cached SpatialGrid cells inside our range
+        self.last_shot = pygame.time.get_ticks() if now is None else now
+        self.pool = pool if pool is not None else PROJECTILE_POOL
 
-    def update(self, enemies, projectiles):
-        now = pygame.time.get_ticks()
+    def update(self, enemies, projectiles, now=None, grid=None):
+        # The simulation passes its own clock; fall back to wall time otherwise
+        if now is None:
+            now = pygame.time.get_ticks()
         if now - self.last_shot > C.TOWER_COOLDOWN:
             # Find the closest enemy
-            target = self.find_target(enemies)
+            target = self.find_target(enemies, grid)
             if target:
                 self.fire(target, projectiles)
                 self.last_shot = now
 
-    def find_target(self, enemies):
+    def find_target(self, enemies, grid=None):
+        if grid is not None:
+            # Only look at the cells our range circle touches
+            if self.grid_cells is None:
+                self.grid_cells = grid.cells_within(self.rect.center, self.range)
+            return grid.nearest(self.rect.center, self.range, self.grid_cells)
+
         best_target = None
         min_dist = self.range
+        center = pygame.Vector2(self.rect.center)
         
         for enemy in enemies:
-            dist = pygame.Vector2(self.rect.center).distance_to(enemy.rect.center)
+            dist = center.distance_to(enemy.rect.center)
             if dist < min_dist:
                 min_dist = dist
                 best_target = enemy
         return best_target
 
     def fire(self, target, projectiles):
-        # We will create the Projectile class next!
-        new_projectile = Projectile(self.rect.center, target)
+        new_projectile = self.pool.acquire(self.rect.center, target)
         projectiles.add(new_projectile)
 
 class Projectile(pygame.sprite.Sprite):
-    def __init__(self, start_pos, target):
+    shared_image = None  # One cyan square shared by every projectile
+
+    def __init__(self, start_pos, target, pool=None):
         super().__init__()
-        self.image = pygame.Surface((8, 8))
-        self.image.fill(C.ACCENT_COLOR) # Cyan
+        if Projectile.shared_image is None:
+            Projectile.shared_image = pygame.Surface((8, 8))
+            Projectile.shared_image.fill(C.ACCENT_COLOR) # Cyan
+        self.image = Projectile.shared_image
         self.rect = self.image.get_rect(center=start_pos)
         
         self.pos = pygame.Vector2(start_pos)
-        self.target = target
         self.speed = C.PROJECTILE_SPEED
+        self.pool = pool
+        self.reset(start_pos, target)
+
+    def reset(self, start_pos, target):
+        """Re-arms a recycled projectile for a new shot."""
+        self.pos.update(start_pos)
+        self.rect.center = start_pos
+        self.target = target
+        self.in_pool = False
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None and not self.in_pool:
+            self.target = None
+            self.pool.release(self)
 
     def update(self):
         if not self.target.alive():
@@ -61,4 +89,36 @@ class Projectile(pygame.sprite.Sprite):
         target_pos = pygame.Vector2(self.target.rect.center)
         direction = (target_pos - self.pos).normalize()
         self.pos += direction * self.speed
-        self.rect.center = self.pos
\ No newline at end of file
+        self.rect.center = self.pos
+
+class ProjectilePool:
+    """Recycles dead projectiles so volleys don't allocate a sprite per shot."""
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self.free = []
+        self.hits = 0    # Shots served from the pool
+        self.misses = 0  # Shots that had to build a new Projectile
+
+    def acquire(self, start_pos, target):
+        if self.free:
+            self.hits += 1
+            projectile = self.free.pop()
+            projectile.reset(start_pos, target)
+            return projectile
+        self.misses += 1
+        return Projectile(start_pos, target, pool=self)
+
+    def release(self, projectile):
+        projectile.in_pool = True
+        if len(self.free) < self.max_size:
+            self.free.append(projectile)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "free": len(self.free),
+                "hit_rate": self.hits / total if total else 0.0}
+
+
+# Default pool for towers that aren't given one
+PROJECTILE_POOL = ProjectilePool()
@@ -0,0 +1,245 @@
+"""Load test for the static game server.
+
+Starts app.py (or web_deploy/app.py, or asgi.py) on a local port and has N
+simulated players load the game page over and over, the way a browser
+does: index.html, then game.apk and favicon.png on the same keep-alive
+connection. A share of page loads are revisits that send If-None-Match.
+Reports requests/s, throughput and p50/p99 time to first and last byte.
+
+That is every request a page load makes to this host: the wasm runtime
+and its support files come from the pygame-web CDN named in index.html,
+and build/web-cache is pygbag's build-time download cache, which is not
+part of the served root. app and asgi are given game/build/web.zip as
+WEB_ROOT unless --web-root says otherwise; web_deploy serves its own
+folder. The run stops after the warm-up if no request has succeeded.
+
+    python loadtest.py --concurrency 50 --duration 20
+    python loadtest.py --target web_deploy --server dev
+    python loadtest.py --target asgi --server uvicorn --out load.json
+    python loadtest.py --url http://127.0.0.1:8080   # an already running server
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# target -> (working directory, WSGI/ASGI module:app)
+TARGETS = {
+    "app": (ROOT, "app:app"),
+    "web_deploy": (os.path.join(ROOT, "web_deploy"), "app:app"),
+    "asgi": (ROOT, "asgi:app"),
+}
+# WEB_ROOT for targets that read it (web_deploy serves its own folder)
+DEFAULT_WEB_ROOTS = {
+    "app": os.path.join(ROOT, "game", "build", "web.zip"),
+    "asgi": os.path.join(ROOT, "game", "build", "web.zip"),
+}
+
+# One page load: the document first, then what pygbag fetches
+PAGE_LOAD = ["/", "/game.apk", "/favicon.png"]
+READ_SIZE = 64 * 1024
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_command(target, server, port):
+    _, module = TARGETS[target]
+    if server == "gunicorn":
+        # Same shape as the Dockerfile CMD
+        return ["gunicorn", "--bind", f"127.0.0.1:{port}", "--workers", "1", "--threads", "8",
+                "--timeout", "0", module]
+    if server == "uvicorn":
+        return ["uvicorn", module, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    return [sys.executable, "app.py"]
+
+
+def start_server(target, server, web_root):
+    port = free_port()
+    cwd, _ = TARGETS[target]
+    env = dict(os.environ, PORT=str(port))
+    web_root = web_root or DEFAULT_WEB_ROOTS.get(target)
+    if web_root:
+        env["WEB_ROOT"] = os.path.abspath(web_root)
+    process = subprocess.Popen(server_command(target, server, port), cwd=cwd, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"server exited with code {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise SystemExit("server did not start listening within 15 s")
+
+
+class Player(threading.Thread):
+    """One browser tab reloading the game until the stop event is set."""
+
+    def __init__(self, base_url, accept_encoding, revisit, stop, results, seed):
+        super().__init__(daemon=True)
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.accept_encoding = accept_encoding
+        self.revisit = revisit
+        self.stop = stop
+        self.results = results  # Shared list of (path, status, bytes, ttfb, ttlb, finished_at)
+        self.random = random.Random(seed)
+        self.etags = {}
+        self.conn = None
+
+    def fetch(self, path, revisit):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        headers = {"Accept-Encoding": self.accept_encoding}
+        if revisit and path in self.etags:
+            headers["If-None-Match"] = self.etags[path]
+        started = time.perf_counter()
+        try:
+            self.conn.request("GET", path, headers=headers)
+            response = self.conn.getresponse()
+            ttfb = time.perf_counter() - started
+            size = 0
+            while True:
+                chunk = response.read(READ_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            self.results.append((path, None, 0, None, None, time.perf_counter()))
+            return
+        finished = time.perf_counter()
+        if response.getheader("ETag"):
+            self.etags[path] = response.getheader("ETag")
+        if response.will_close:
+            self.conn.close()
+            self.conn = None
+        self.results.append((path, response.status, size, ttfb, finished - started, finished))
+
+    def run(self):
+        while not self.stop.is_set():
+            revisit = self.random.random() < self.revisit
+            for path in PAGE_LOAD:
+                if self.stop.is_set():
+                    break
+                self.fetch(path, revisit)
+        if self.conn is not None:
+            self.conn.close()
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, round((len(values) - 1) * p / 100))]
+
+
+def summarize(rows, seconds):
+    ok = [row for row in rows if row[1] is not None and row[1] < 400]
+    ttfb = [row[3] * 1000 for row in ok]
+    ttlb = [row[4] * 1000 for row in ok]
+    total_bytes = sum(row[2] for row in ok)
+    return {
+        "requests": len(rows),
+        "errors": len(rows) - len(ok),
+        "not_modified": sum(1 for row in ok if row[1] == 304),
+        "rps": len(ok) / seconds,
+        "mib_per_sec": total_bytes / seconds / 1024 / 1024,
+        "ttfb_p50_ms": percentile(ttfb, 50),
+        "ttfb_p99_ms": percentile(ttfb, 99),
+        "ttlb_p50_ms": percentile(ttlb, 50),
+        "ttlb_p99_ms": percentile(ttlb, 99),
+    }
+
+
+def run_load(base_url, concurrency, duration, warmup, accept_encoding, revisit, seed):
+    stop = threading.Event()
+    results = []
+    players = [Player(base_url, accept_encoding, revisit, stop, results, seed + i) for i in range(concurrency)]
+    for player in players:
+        player.start()
+    time.sleep(warmup)
+    warm = list(results)
+    if warm and not any(row[1] is not None and row[1] < 400 for row in warm):
+        stop.set()
+        statuses = sorted({str(row[1] or "error") for row in warm})
+        raise SystemExit(f"no successful request during the warm-up ({', '.join(statuses)}); "
+                         "check --web-root or --url")
+    measured_from = time.perf_counter()
+    time.sleep(duration)
+    measured_to = time.perf_counter()
+    stop.set()
+    for player in players:
+        player.join(timeout=30)
+    # Only requests that finished inside the measured window count
+    rows = [row for row in results if measured_from <= row[5] <= measured_to]
+    report = {"overall": summarize(rows, measured_to - measured_from)}
+    for path in PAGE_LOAD:
+        report[path] = summarize([row for row in rows if row[0] == path], measured_to - measured_from)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=sorted(TARGETS), default="app")
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn", "dev"],
+                        help="how to run the target (default: gunicorn, uvicorn for asgi)")
+    parser.add_argument("--web-root", help="WEB_ROOT for the server: a build directory or web.zip "
+                                           "(default: game/build/web.zip for app and asgi)")
+    parser.add_argument("--url", help="load an already running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=20, help="simultaneous players")
+    parser.add_argument("--duration", type=float, default=15, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2, help="unmeasured seconds before that")
+    parser.add_argument("--accept-encoding", default="gzip, deflate, br")
+    parser.add_argument("--revisit", type=float, default=0.3, help="share of page loads sending If-None-Match")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args()
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        server = args.server or ("uvicorn" if args.target == "asgi" else "gunicorn")
+        if server == "dev" and args.target == "asgi":
+            parser.error("asgi needs --server uvicorn")
+        process, base_url = start_server(args.target, server, args.web_root)
+    try:
+        report = run_load(base_url, args.concurrency, args.duration, args.warmup,
+                          args.accept_encoding, args.revisit, args.seed)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(f"{'path':<14}{'reqs':>7}{'err':>5}{'304':>6}{'req/s':>9}{'MiB/s':>8}"
+          f"{'ttfb p50':>10}{'ttfb p99':>10}{'ttlb p50':>10}{'ttlb p99':>10}")
+    for name, stats in report.items():
+        print(f"{name:<14}{stats['requests']:>7}{stats['errors']:>5}{stats['not_modified']:>6}{stats['rps']:>9.1f}"
+              f"{stats['mib_per_sec']:>8.1f}{stats['ttfb_p50_ms']:>10.1f}{stats['ttfb_p99_ms']:>10.1f}"
+              f"{stats['ttlb_p50_ms']:>10.1f}{stats['ttlb_p99_ms']:>10.1f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"target": args.target, "url": args.url, "concurrency": args.concurrency,
+                       "duration": args.duration, "results": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Leaderboard storage for the game host: write-behind buffer in front of SQLite.
+
+submit() only appends to an in-memory buffer; a background thread writes
+the buffer to SQLite (WAL mode) in one transaction every flush_interval
+seconds, or sooner once batch_size entries are waiting. The top scores are
+re-read after each flush and kept in memory, so reads never touch the
+database.
+"""
+import time
+import atexit
+import sqlite3
+import threading
+
+MAX_NAME_LENGTH = 16
+
+
+def clean_submission(data):
+    """Validates a posted score; returns the row to store, or raises ValueError."""
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    name = data.get("name", "ANON")
+    if not isinstance(name, str):
+        raise ValueError("name must be a string")
+    name = " ".join(name.split())[:MAX_NAME_LENGTH] or "ANON"
+    values = []
+    for field, low, high in (("score", 0, 10 ** 9), ("wave", 1, 10 ** 4), ("integrity", 0, 100)):
+        value = data.get(field)
+        # bool is an int subclass; reject it explicitly
+        if not isinstance(value, int) or isinstance(value, bool) or not low <= value <= high:
+            raise ValueError(f"{field} must be an integer in [{low}, {high}]")
+        values.append(value)
+    return (name, *values, time.time())
+
+
+class ScoreBoard:
+    """Buffered score submissions and a cached top list over one SQLite file."""
+
+    def __init__(self, path, flush_interval=2.0, batch_size=200, max_buffer=10000, top_size=100):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.top_size = top_size
+        self.buffer = []
+        self.lock = threading.Lock()      # Guards buffer
+        self.db_lock = threading.Lock()   # One writer; flushes may come from the thread or close()
+        self.wake = threading.Event()
+        self.closed = False
+        self.flushed = 0
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                name TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                wave INTEGER NOT NULL,
+                integrity INTEGER NOT NULL,
+                created REAL NOT NULL
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS scores_rank ON scores (score DESC, wave DESC)")
+        self.db.commit()
+        self.top_cache = self._read_top()
+
+        self.thread = threading.Thread(target=self._run, name="scores-flush", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def submit(self, row):
+        """Queues a cleaned row; False if the buffer is full (the caller should answer 503)."""
+        with self.lock:
+            if self.closed or len(self.buffer) >= self.max_buffer:
+                return False
+            self.buffer.append(row)
+            full = len(self.buffer) >= self.batch_size
+        if full:
+            self.wake.set()
+        return True
+
+    def top(self, limit=10):
+        """The best `limit` scores as of the last flush."""
+        return self.top_cache[:limit]
+
+    def _read_top(self):
+        rows = self.db.execute(
+            "SELECT name, score, wave, integrity, created FROM scores ORDER BY score DESC, wave DESC LIMIT ?",
+            (self.top_size,)).fetchall()
+        return [{"name": name, "score": score, "wave": wave, "integrity": integrity, "created": created}
+                for name, score, wave, integrity, created in rows]
+
+    def flush(self):
+        with self.lock:
+            batch, self.buffer = self.buffer, []
+        if not batch:
+            return 0
+        with self.db_lock:
+            try:
+                with self.db:  # One transaction per batch
+                    self.db.executemany(
+                        "INSERT INTO scores (name, score, wave, integrity, created) VALUES (?, ?, ?, ?, ?)", batch)
+            except sqlite3.Error:
+                # Put the batch back in front so the next flush retries it
+                with self.lock:
+                    room = max(0, self.max_buffer - len(self.buffer))
+                    self.buffer[:0] = batch[:room]
+                raise
+            # Swapped in whole, so readers see the old list or the new one
+            self.top_cache = self._read_top()
+        self.flushed += len(batch)
+        return len(batch)
+
+    def _run(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Score flush failed: {e}")
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.wake.set()
+        self.thread.join(timeout=5)
+        self.flush()
+        self.db.close()
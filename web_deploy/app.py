@@ -1,9 +1,30 @@
-from flask import Flask, send_from_directory
+from flask import Flask, request, send_from_directory, abort
+from werkzeug.security import safe_join
+import mimetypes
 import os
+import re
 app = Flask(__name__, static_folder='.')
+mimetypes.add_type('application/octet-stream', '.apk')
+# .br/.gz variants come from `python compress_assets.py web_deploy` before deploying
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+HASHED_NAME = re.compile(r'(^|[/.-])[0-9a-f]{16,}\.[^/]+$')
+def send_asset(path):
+    # Relative to this file, like send_from_directory, not to the working directory
+    full = safe_join(app.root_path, path)
+    if full is None or not os.path.isfile(full): abort(404)
+    filename, encoding = path, None
+    for name, suffix in ENCODINGS:
+        if request.accept_encodings[name] > 0 and os.path.isfile(full + suffix) and os.path.getmtime(full + suffix) >= os.path.getmtime(full):
+            filename, encoding = path + suffix, name
+            break
+    response = send_from_directory(app.root_path, filename, mimetype=mimetypes.guess_type(path)[0] or 'application/octet-stream')
+    if encoding: response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable' if HASHED_NAME.search(path) else 'no-cache'
+    return response
 @app.route('/')
-def serve_index(): return send_from_directory('.', 'index.html')
+def serve_index(): return send_asset('index.html')
 @app.route('/<path:path>')
-def serve_static(path): return send_from_directory('.', path)
+def serve_static(path): return send_asset(path)
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))